@@ -126,10 +126,14 @@ def webhook():
                 # Metin mesajını işle
                 result = process_tradingview_alert(webhook_text)
                 return jsonify(result)
+            elif isinstance(data, list):
+                # Birden fazla alarm tek istekte geldiyse birlikte işle
+                logging.info(f"Processing batch of {len(data)} webhook alerts")
+                return jsonify(webhook_handler.process_webhook_batch(data))
             else:
                 # Normal JSON nesnesini olduğu gibi işle
                 logging.info(f"Processing webhook JSON data: {data}")
-                return jsonify(webhook_handler.process_webhook(data))
+                return jsonify(webhook_handler.enqueue_webhook(data))
         else:
             # Bu bir metin (text) mesajı, direkt ayrıştır
             webhook_text = request.data.decode('utf-8')
@@ -184,45 +188,25 @@ def process_tradingview_alert(alert_text):
             
             logging.info(f"Searching ticker data for symbol: {symbol}")
             
-            # First try exact symbol match
-            match = ticker_data[ticker_data['Symbol'] == symbol]
-            if not match.empty:
-                epic = match.iloc[0]['IG EPIC']
-                if not epic or pd.isna(epic) or epic == '':
-                    logging.error(f"Missing EPIC code for symbol {symbol} in ticker data")
-                    return {
-                        "status": "error",
-                        "message": f"Missing EPIC code for symbol: {symbol}"
-                    }
-                logging.info(f"Found EPIC via exact match: {epic}")
-            else:
-                logging.info(f"No exact match found for symbol: {symbol}")
-                # Try matching with base symbol if it contains a colon
-                if ':' in symbol:
-                    base_symbol = symbol.split(':')[1]
-                    logging.info(f"Trying to match with base symbol: {base_symbol}")
-                    match = ticker_data[ticker_data['Symbol'].str.contains(base_symbol, case=True, na=False)]
-                    if not match.empty:
-                        epic = match.iloc[0]['IG EPIC']
-                        if not epic or pd.isna(epic) or epic == '':
-                            logging.error(f"Missing EPIC code for base symbol {base_symbol} in ticker data")
-                            return {
-                                "status": "error",
-                                "message": f"Missing EPIC code for symbol: {symbol}"
-                            }
-                        logging.info(f"Found EPIC via base symbol match: {epic}")
-                    else:
-                        logging.error(f"No match found for base symbol: {base_symbol}")
-                        return {
-                            "status": "error",
-                            "message": f"Could not find symbol in ticker data: {symbol}"
-                        }
-                else:
-                    logging.error(f"Symbol not found in ticker data: {symbol}")
-                    return {
-                        "status": "error",
-                        "message": f"Could not find symbol in ticker data: {symbol}"
-                    }
+            # EPIC: exact symbol, then the symbol without its exchange prefix (same
+            # lookups as JSON webhooks, no substring matching)
+            epic = webhook_handler._convert_symbol_to_epic(symbol)
+            if epic is None:
+                logging.error(f"Symbol not found in ticker data: {symbol}")
+                return {
+                    "status": "error",
+                    "message": f"Could not find symbol in ticker data: {symbol}"
+                }
+            if pd.isna(epic) or epic == '':
+                logging.error(f"Missing EPIC code for symbol {symbol} in ticker data")
+                return {
+                    "status": "error",
+                    "message": f"Missing EPIC code for symbol: {symbol}"
+                }
+            logging.info(f"Found EPIC for {symbol}: {epic}")
+            
+            # ATR settings come from the exact symbol row only
+            ticker_row = ticker_data[ticker_data['Symbol'] == symbol]
         except Exception as e:
             logging.error(f"Error looking up symbol in ticker data: {e}")
             return {
@@ -247,8 +231,7 @@ def process_tradingview_alert(alert_text):
                 # Extract ATR values
                 atr_values = [float(parts[i]) for i in range(3, 13)]
                 
-                # Get ATR indices for stop loss and take profit from ticker data
-                ticker_row = ticker_data[ticker_data['Symbol'] == symbol]
+                # Get ATR indices for stop loss and take profit from ticker data (exact symbol match only)
                 if not ticker_row.empty:
                     atr_sl_period = int(ticker_row['ATR Stop Loss Period'].values[0])
                     atr_tp_period = int(ticker_row['ATR Profit Target Period'].values[0])
@@ -322,7 +305,7 @@ def process_tradingview_alert(alert_text):
         logging.info(f"Using default order type from settings: {default_order_type}")
         
         logging.info(f"Processed webhook data: {processed_data}")
-        result = webhook_handler.process_webhook(processed_data)
+        result = webhook_handler.enqueue_webhook(processed_data)
         return result
         
     except Exception as e:
@@ -481,13 +464,14 @@ def get_today_trades():
         # Format the response
         formatted_trades = {}
         for ticker, trade in today_trades.items():
+            params = trade.params or {}
             formatted_trades[ticker] = {
-                "time": trade.get("time").isoformat() if trade.get("time") else None,
-                "direction": trade.get("params", {}).get("direction"),
-                "entry_price": trade.get("params", {}).get("entry_price"),
-                "position_size": trade.get("params", {}).get("position_size"),
-                "deal_reference": trade.get("deal_reference"),
-                "epic": trade.get("epic")
+                "time": trade.time.isoformat() if trade.time else None,
+                "direction": trade.direction,
+                "entry_price": params.get("entry_price"),
+                "position_size": params.get("position_size"),
+                "deal_reference": trade.deal_reference,
+                "epic": trade.epic
             }
         
         return jsonify({
@@ -1259,7 +1243,7 @@ def dashboard():
             # Count trades for this day
             count = 0
             for trade in webhook_handler.trade_manager.today_trades.values():
-                trade_date = trade.get('time', datetime.datetime.now()).strftime('%Y-%m-%d')
+                trade_date = trade.time.strftime('%Y-%m-%d')
                 if trade_date == date:
                     count += 1
             activity_counts.append(count)
@@ -1311,7 +1295,8 @@ def dashboard_positions():
                 position['profit'] = round((level - current_price) * size, 2)
     
     # Log positions
-    logging.info(f"Positions data: {json.dumps(positions)}")
+    if logging.getLogger().isEnabledFor(logging.INFO):
+        logging.info("Positions data: %s", json.dumps(positions))
     
     # Get working orders directly from the IG API
     try:
@@ -1342,7 +1327,8 @@ def dashboard_positions():
                     order['level'] = str(round(stop_level * 1.05, 2))  # 5% above stop
         
         # Log orders
-        logging.info(f"Orders data: {json.dumps(orders)}")
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            logging.info("Orders data: %s", json.dumps(orders))
         
     except Exception as e:
         logging.error(f"Error getting working orders: {e}")
@@ -1877,6 +1863,9 @@ def upload_ticker_data():
             # Save the new data
             new_data.to_csv(ticker_data_path, index=False)
             
+            # Drop EPICs and lookups built from the old CSV
+            webhook_handler.reload_ticker_data()
+            
             # Clean up temp file
             os.remove(temp_file_path)
             
@@ -2191,6 +2180,7 @@ def update_dividend_dates():
         
         if result:
             logging.info("Dividend dates updated successfully")
+            webhook_handler.reload_ticker_data()
             flash('Dividend dates updated successfully', 'success')
             return jsonify({
                 "status": "success",
@@ -2279,6 +2269,7 @@ def update_ticker_data():
         try:
             ticker_data.to_csv(settings_manager.ticker_data_file, index=False)
             logger.info(f"Saved changes to {settings_manager.ticker_data_file}")
+            webhook_handler.reload_ticker_data()
             
             # Verify the changes were saved
             verification = pd.read_csv(settings_manager.ticker_data_file)
@@ -21,6 +21,7 @@ import logging
 import unittest
 import requests
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 from unittest import mock
 from pathlib import Path
@@ -159,6 +160,77 @@ class TestTradeCalculator(unittest.TestCase):
         except Exception as e:
             self.fail(f"Kar hesaplama hatası: {str(e)}")
 
+class TestTradeCalculatorBatch(unittest.TestCase):
+    """Toplu (vektörel) ticaret parametre hesaplamasını test eder."""
+    
+    def setUp(self):
+        """Örnek ticker verisiyle TradeCalculator oluşturur."""
+        self.ticker_data = pd.DataFrame({
+            'Symbol': ['LSE_DLY:SRP', 'BATS:PML'],
+            'IG EPIC': ['UA.D.SRPLN.DAILY.IP', 'UC.D.PMLUS.DAILY.IP'],
+            'ATR Stop Loss Period': [4, 2],
+            'ATR Stop Loss Multiple': [189, 150],
+            'ATR Profit Target Period': [6, 3],
+            'ATR Profit Multiple': [180, 120],
+            'Postion Size Max GBP': [10000, 5000],
+            'Opening Price Multiple': [101, 98]
+        })
+        self.calculator = TradeCalculator(self.ticker_data)
+        self.atr_values = [0.6, 1.819, 2.378, 2.839, 3.204, 3.478, 3.68, 3.83, 3.94, 4.023]
+    
+    def test_batch_matches_single_calculation(self):
+        """Toplu hesaplamanın tekil hesaplamayla aynı sonucu verdiğini test eder."""
+        tickers = ['LSE_DLY:SRP', 'BATS:PML', 'LSE_DLY:SRP']
+        directions = np.array(['UP', 'DOWN', 'DOWN'])
+        prices = np.array([189.8, 7.51, 189.8])
+        ig_prices = np.array([18980.0, np.nan, 190.2])
+        
+        results = self.calculator.calculate_trade_parameters_batch(
+            tickers, directions, prices, np.array([self.atr_values] * 3), ig_prices
+        )
+        
+        for i, ticker in enumerate(tickers):
+            ig_price = None if np.isnan(ig_prices[i]) else ig_prices[i]
+            expected = self.calculator.calculate_trade_parameters(
+                ticker, directions[i], prices[i], self.atr_values, ig_price=ig_price
+            )
+            self.assertEqual(results[i]['direction'], expected['direction'])
+            for key in ('price_level', 'entry_price', 'stop_distance', 'limit_distance', 'position_size'):
+                self.assertAlmostEqual(results[i][key], expected[key], places=2)
+        logger.info("Toplu hesaplama testi başarılı")
+    
+    def test_batch_rounding_ties_match_single(self):
+        """Yarım değerlerde (0.125) toplu ve tekil yuvarlamanın birebir aynı olduğunu test eder."""
+        calculator = TradeCalculator(pd.DataFrame({
+            'Symbol': ['TEST:TIE'],
+            'IG EPIC': ['TEST.TIE'],
+            'ATR Stop Loss Period': [1],
+            'ATR Stop Loss Multiple': [1],
+            'ATR Profit Target Period': [1],
+            'ATR Profit Multiple': [1],
+            'Postion Size Max GBP': [1],
+            'Opening Price Multiple': [100]
+        }))
+        atr_values = [0.5] * 10
+        
+        for direction in ('UP', 'DOWN'):
+            # 1 GBP / 8.0 = 0.125 -> 0.13 (yarım yukarı)
+            expected = calculator.calculate_trade_parameters('TEST:TIE', direction, 8.0, atr_values)
+            result = calculator.calculate_trade_parameters_batch(
+                ['TEST:TIE'], np.array([direction]), np.array([8.0]), np.array([atr_values])
+            )[0]
+            self.assertEqual(expected['position_size'], 0.13)
+            self.assertEqual(result, expected)
+        logger.info("Toplu yuvarlama eşitlik testi başarılı")
+    
+    def test_batch_unknown_ticker(self):
+        """Konfigürasyonda olmayan ticker için None döndüğünü test eder."""
+        results = self.calculator.calculate_trade_parameters_batch(
+            ['UNKNOWN:XYZ'], np.array(['UP']), np.array([10.0]), np.array([self.atr_values])
+        )
+        self.assertEqual(results, [None])
+        logger.info("Bilinmeyen ticker toplu hesaplama testi başarılı")
+
 class TestWebhookHandler(unittest.TestCase):
     """Webhook işleme fonksiyonlarını test eder."""
     
@@ -230,6 +302,18 @@ class TestWebhookHandler(unittest.TestCase):
         except Exception as e:
             self.fail(f"Webhook işleme hatası: {str(e)}")
     
+    def test_convert_symbol_to_epic_prefix(self):
+        """Borsa öneki farklı sembollerin eşleştiğini, alt dizelerin eşleşmediğini test eder."""
+        self.mock_settings_manager.get_ticker_data.return_value = pd.DataFrame({
+            'Symbol': ['NASDAQ:AAPLONG', 'NASDAQ:AAPL'],
+            'IG EPIC': ['EPIC.AAPLONG', 'EPIC.AAPL']
+        })
+        
+        self.assertEqual(self.webhook_handler._convert_symbol_to_epic('BATS:AAPL'), 'EPIC.AAPL')
+        self.assertEqual(self.webhook_handler._convert_symbol_to_epic('AAPL'), 'EPIC.AAPL')
+        self.assertIsNone(self.webhook_handler._convert_symbol_to_epic('BATS:AAPLO'))
+        logger.info("Sembol önek eşleştirme testi başarılı")
+    
     def test_process_webhook_sell_signal(self):
         """Satış sinyali webhook'unu test eder."""
         # Örnek TradingView sinyal JSON'u
@@ -731,6 +815,109 @@ class TestUserManagement(unittest.TestCase):
         self.assertIsNotNone(test_user.get('last_login'))
         logger.info("Son giriş bilgisi testi başarılı")
 
+class TestTTLCache(unittest.TestCase):
+    """Süreli LRU önbelleğini test eder."""
+    
+    def test_lru_eviction(self):
+        """Kapasite dolunca en eski kullanılan kaydın silindiğini test eder."""
+        from trading_bot.cache import TTLCache
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache['a'] = 1
+        cache['b'] = 2
+        cache.get('a')  # 'a' artık en son kullanılan
+        cache['c'] = 3
+        
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        logger.info("LRU önbellek testi başarılı")
+    
+    def test_ttl_expiry(self):
+        """Süresi dolan kayıtların döndürülmediğini test eder."""
+        from trading_bot.cache import TTLCache
+        cache = TTLCache(maxsize=10, ttl=0.01)
+        cache['a'] = 1
+        time.sleep(0.02)
+        
+        self.assertNotIn('a', cache)
+        self.assertEqual(cache.get('a', 'default'), 'default')
+        logger.info("TTL önbellek testi başarılı")
+
+    def test_file_cache_persists(self):
+        """Dosya önbelleğinin yeni örnekte de okunabildiğini test eder."""
+        import tempfile
+        from trading_bot.cache import FileCache
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'epic_cache.json')
+            FileCache(path).set('BATS:AAPL', 'UA.D.AAPL.DAILY.IP')
+            FileCache(path).set('BATS:MSFT', 'UA.D.MSFT.DAILY.IP', expire=-1)
+            
+            cache = FileCache(path)
+            self.assertEqual(cache.get('BATS:AAPL'), 'UA.D.AAPL.DAILY.IP')
+            self.assertIsNone(cache.get('BATS:MSFT'))
+        logger.info("Dosya önbellek testi başarılı")
+
+class TestTokenBucket(unittest.TestCase):
+    """İstemci tarafı istek sınırlayıcısını test eder."""
+
+    def test_burst_then_wait(self):
+        """Kapasite kadar isteğin beklemeden, sonrakilerin beklemeyle geçtiğini test eder."""
+        from trading_bot.rate_limit import TokenBucket
+        bucket = TokenBucket(rate=100, capacity=3)
+
+        self.assertEqual([bucket.acquire() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertGreater(bucket.acquire(), 0)
+        logger.info("Token bucket testi başarılı")
+
+class TestPriceBands(unittest.TestCase):
+    """Fiyat bandına göre mesafe düzeltmelerini test eder."""
+
+    def test_distance_scaling_by_band(self):
+        """Düşük ve yüksek fiyat bantlarında mesafe ölçeklemesini test eder."""
+        from trading_bot.trade_manager import _distance_scaler
+        cases = [
+            # (IG fiyatı, limit seviyesi, çarpan, beklenen stop, beklenen limit)
+            (50.0, 50.0, 1.0, 2.0, 4.0),
+            (0.5, 50.0, 0.01, 0.02, 0.04),
+            (200.0, 200.0, 1.0, 2.0, 4.0),
+            (300.0, 200.0, 1.0, 3.0, 6.0),
+        ]
+        for current_price, limit_level, multiplier, stop, limit in cases:
+            scale = _distance_scaler(current_price, limit_level)
+            result = scale(2.0, 4.0, current_price, limit_level, multiplier)
+            self.assertEqual(tuple(round(v, 6) for v in result), (stop, limit))
+        logger.info("Fiyat bandı ölçekleme testi başarılı")
+
+    def test_cap_distance(self):
+        """Format hatası nedeniyle çok büyük kalan mesafelerin küçültüldüğünü test eder."""
+        from trading_bot.trade_manager import _cap_distance
+        self.assertEqual(_cap_distance("Stop", 5.0, 200.0), 5.0)
+        self.assertEqual(_cap_distance("Stop", 500.0, 200.0), 5.0)
+        self.assertEqual(_cap_distance("Stop", 150000.0, 20000.0), 1500.0)
+        logger.info("Mesafe sınırlama testi başarılı")
+
+class TestHistoryBulk(unittest.TestCase):
+    """Toplu geçmiş sorgusunun tarih aralıklarına bölünmesini test eder."""
+    
+    def test_split_by_day(self):
+        """Kayıtların tarih aralıklarına sıralarını koruyarak dağıtıldığını test eder."""
+        from datetime import date
+        from trading_bot.trade_manager import _split_by_day
+        rows = [
+            {'date': '2024-03-03T10:00:00', 'reference': 'c'},
+            {'date': '2024-03-01T10:00:00', 'reference': 'a'},
+            {'date': None, 'reference': 'x'},
+            {'date': '2024-03-02T09:00:00', 'reference': 'b'},
+        ]
+        parts = _split_by_day(rows, [
+            (date(2024, 3, 1), date(2024, 3, 1)),
+            (date(2024, 3, 2), date(2024, 3, 3)),
+            (date(2024, 3, 1), date(2024, 3, 3)),
+        ])
+        
+        self.assertEqual([[row['reference'] for row in part] for part in parts], [['a'], ['c', 'b'], ['c', 'a', 'b']])
+        logger.info("Toplu geçmiş bölme testi başarılı")
+
 class TestLogging(unittest.TestCase):
     """Loglama sistemini test eder."""
     
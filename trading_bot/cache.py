@@ -0,0 +1,162 @@
+"""
+Small in-memory caches used by the Trading Bot
+"""
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class TTLCache:
+    """
+    Size-bounded LRU cache whose entries expire after a fixed time-to-live.
+    
+    Least recently used entries are evicted once maxsize is reached; expired
+    entries are dropped lazily when they are accessed.
+    """
+    
+    def __init__(self, maxsize=128, ttl=60.0):
+        """
+        Initialize the cache
+        
+        Args:
+            maxsize (int): Maximum number of entries to keep
+            ttl (float): Time-to-live of each entry in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        """
+        Get a value from the cache
+        
+        Args:
+            key: Cache key
+            default: Value to return if the key is missing or expired
+        
+        Returns:
+            The cached value or default
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            
+            self._data.move_to_end(key)
+            return value
+    
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def __contains__(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            return item is not None and item[0] > time.monotonic()
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+    
+    def pop(self, key, default=None):
+        """Remove a key from the cache and return its value"""
+        with self._lock:
+            item = self._data.pop(key, None)
+            return default if item is None else item[1]
+    
+    def clear(self):
+        """Remove all entries from the cache"""
+        with self._lock:
+            self._data.clear()
+
+class FileCache:
+    """
+    Small key/value cache persisted as a JSON file so it survives restarts.
+    
+    Each entry stores its own expiry time (wall clock, since it outlives the
+    process). The file is read lazily on first access and rewritten atomically
+    on every update.
+    """
+    
+    def __init__(self, path, ttl=7 * 86400):
+        """
+        Initialize the cache
+        
+        Args:
+            path (str): Path of the JSON file backing the cache
+            ttl (float): Time-to-live of each entry in seconds
+        """
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        self._data = None
+        self._lock = threading.Lock()
+    
+    def _load(self):
+        if self._data is not None:
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self._data = json.load(f)
+        except (OSError, ValueError):
+            self._data = {}
+    
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self._data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write cache file {self.path}: {e}")
+    
+    def get(self, key, default=None):
+        """
+        Get a value from the cache
+        
+        Args:
+            key (str): Cache key
+            default: Value to return if the key is missing or expired
+        
+        Returns:
+            The cached value or default
+        """
+        with self._lock:
+            self._load()
+            item = self._data.get(key)
+            if item is None:
+                return default
+            
+            expires_at, value = item
+            if expires_at <= time.time():
+                del self._data[key]
+                self._save()
+                return default
+            return value
+    
+    def set(self, key, value, expire=None):
+        """
+        Store a value and persist the cache to disk
+        
+        Args:
+            key (str): Cache key
+            value: JSON serializable value
+            expire (float, optional): Time-to-live in seconds, defaults to the cache ttl
+        """
+        with self._lock:
+            self._load()
+            self._data[key] = [time.time() + (self.ttl if expire is None else expire), value]
+            self._save()
@@ -21,6 +21,10 @@ MAX_OPEN_POSITIONS = 10
 ALERT_MAX_AGE_SECONDS = 5
 CSV_FILE_PATH = os.getenv("CSV_FILE_PATH", "ticker_data.csv")
 TICKER_DATA_FILE = CSV_FILE_PATH  # Alias for backward compatibility
+EPIC_CACHE_FILE = os.getenv("EPIC_CACHE_FILE", os.path.join("~", ".trading_bot", "epic_cache.json"))
+EPIC_CACHE_TTL_SECONDS = 7 * 86400  # EPICs found via the IG search API are kept for a week
+IG_REQUESTS_PER_SECOND = float(os.getenv("IG_REQUESTS_PER_SECOND", "25"))  # Client-side limit for all IG requests
+IG_REQUEST_BURST = int(os.getenv("IG_REQUEST_BURST", "30"))  # Requests allowed back to back before limiting
 
 # Logging Configuration
 LOG_LEVEL = logging.INFO
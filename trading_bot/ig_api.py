@@ -3,18 +3,63 @@ IG Markets API integration for the Trading Bot
 """
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-from datetime import datetime, timedelta
-from trading_bot.config import IG_USERNAME, IG_PASSWORD, IG_API_KEY, IG_ACCOUNT_TYPE, TICKER_DATA_FILE
+from datetime import date, timedelta
+from trading_bot.config import (
+    IG_USERNAME, IG_PASSWORD, IG_API_KEY, IG_ACCOUNT_TYPE, TICKER_DATA_FILE, EPIC_CACHE_FILE, EPIC_CACHE_TTL_SECONDS,
+    IG_REQUESTS_PER_SECOND, IG_REQUEST_BURST
+)
+from trading_bot.cache import FileCache
+from trading_bot.rate_limit import TokenBucket
 import os
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Shared read-only fallback for missing nested dicts in IG responses (never mutate)
+_EMPTY = {}
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that takes a token from a bucket before every request it sends"""
+    
+    def __init__(self, bucket, **kwargs):
+        self.bucket = bucket
+        super().__init__(**kwargs)
+    
+    def send(self, request, **kwargs):
+        waited = self.bucket.acquire()
+        if waited:
+            logger.debug("Rate limit: waited %.3fs before %s %s", waited, request.method, request.url)
+        return super().send(request, **kwargs)
+
+# One connection pool for every IGClient in the process (app.py and TradeManager each
+# create a client), so they share warm keep-alive connections to the IG host and
+# one request budget, smoothing bursts instead of running into IG's 429 responses
+_SHARED_ADAPTER = _RateLimitedAdapter(
+    TokenBucket(rate=IG_REQUESTS_PER_SECOND, capacity=IG_REQUEST_BURST),
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(['GET'])
+    )
+)
+
 class IGClient:
     """Client for interacting with the IG Markets API"""
     
-    def __init__(self):
+    def __init__(self, session=None):
+        """
+        Initialize the IG client
+        
+        Args:
+            session (requests.Session, optional): Session to send requests through.
+                Defaults to a new pooled keep-alive session.
+        """
         # Demo veya live API URL'sini ayarla
         if IG_ACCOUNT_TYPE and IG_ACCOUNT_TYPE.upper() == 'DEMO':
             self.BASE_URL = "https://demo-api.ig.com/gateway/deal"
@@ -23,7 +68,7 @@ class IGClient:
             self.BASE_URL = "https://api.ig.com/gateway/deal"
             logger.info(f"Using LIVE API endpoint: {self.BASE_URL}")
             
-        self.session = requests.Session()
+        self.session = session if session is not None else self._create_session()
         self.session_token = None
         self.cst = None
         self.security_token = None
@@ -36,6 +81,18 @@ class IGClient:
         self.account_type = IG_ACCOUNT_TYPE
         self.trade_history = {}  # İşlem geçmişini depolamak için sözlük
         self.default_order_type = 'LIMIT'  # Default order type
+        self.epic_disk_cache = FileCache(EPIC_CACHE_FILE, ttl=EPIC_CACHE_TTL_SECONDS)  # API search sonuçları, restart sonrası da geçerli
+    
+    @staticmethod
+    def _create_session():
+        """
+        Create an HTTP session on the shared connection pool so IG calls reuse their TCP/TLS connections
+        
+        Only idempotent GET requests are retried; order POSTs are never resent.
+        """
+        session = requests.Session()
+        session.mount('https://', _SHARED_ADAPTER)
+        return session
     
     def login(self):
         """Login to IG Markets API"""
@@ -195,7 +252,7 @@ class IGClient:
         
         # Find the position with the matching deal ID
         for position in positions:
-            if position.get('position', {}).get('dealId') == deal_id:
+            if (position.get('position') or _EMPTY).get('dealId') == deal_id:
                 return position
         
         logger.warning(f"No position found with deal ID: {deal_id}")
@@ -223,9 +280,9 @@ class IGClient:
             
         # Set default dates if not provided
         if from_date is None:
-            from_date = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
+            from_date = (date.today() - timedelta(days=7)).isoformat()
         if to_date is None:
-            to_date = datetime.now().strftime("%Y-%m-%d")
+            to_date = date.today().isoformat()
         
         url = f"{self.BASE_URL}/history/transactions"
         headers = self.headers.copy()
@@ -278,9 +335,9 @@ class IGClient:
         
         # Set default dates if not provided
         if from_date is None:
-            from_date = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
+            from_date = (date.today() - timedelta(days=7)).isoformat()
         if to_date is None:
-            to_date = datetime.now().strftime("%Y-%m-%d")
+            to_date = date.today().isoformat()
         
         url = f"{self.BASE_URL}/history/activity"
         headers = self.headers.copy()
@@ -334,13 +391,14 @@ class IGClient:
                 # Check if this is an open position
                 position = self.get_position_by_deal_id(deal_id)
                 if position:
+                    pos = position.get('position') or _EMPTY
                     return {
                         'status': 'OPEN',
                         'dealReference': deal_reference,
                         'dealId': deal_id,
-                        'direction': position.get('position', {}).get('direction'),
-                        'size': position.get('position', {}).get('size'),
-                        'profit': position.get('position', {}).get('profit', {}).get('value'),
+                        'direction': pos.get('direction'),
+                        'size': pos.get('size'),
+                        'profit': (pos.get('profit') or _EMPTY).get('value'),
                         'details': position
                     }
             
@@ -348,11 +406,12 @@ class IGClient:
             activities = self.get_activity_history()
             if activities:
                 for activity in activities:
-                    if activity.get('details', {}).get('dealReference') == deal_reference:
+                    details = activity.get('details') or _EMPTY
+                    if details.get('dealReference') == deal_reference:
                         return {
                             'status': activity.get('status'),
                             'dealReference': deal_reference,
-                            'dealId': activity.get('details', {}).get('dealId'),
+                            'dealId': details.get('dealId'),
                             'activity_type': activity.get('type'),
                             'details': activity
                         }
@@ -490,8 +549,8 @@ class IGClient:
                     data = response.json()
                     
                     # Extract relevant details
-                    snapshot = data.get('snapshot', {})
-                    dealing_rules = data.get('dealingRules', {})
+                    snapshot = data.get('snapshot') or _EMPTY
+                    dealing_rules = data.get('dealingRules') or _EMPTY
                 
                     # Get bid/offer prices
                     bid = snapshot.get('bid')
@@ -517,9 +576,9 @@ class IGClient:
                         'bid': bid,
                         'offer': offer,
                         'market_status': market_status,
-                        'min_deal_size': dealing_rules.get('minDealSize', {}).get('value', 0.1),
-                        'min_stop_distance': dealing_rules.get('minNormalStopOrLimitDistance', {}).get('value', 0),
-                        'min_limit_distance': dealing_rules.get('minControlledRiskStopDistance', {}).get('value', 0)
+                        'min_deal_size': (dealing_rules.get('minDealSize') or _EMPTY).get('value', 0.1),
+                        'min_stop_distance': (dealing_rules.get('minNormalStopOrLimitDistance') or _EMPTY).get('value', 0),
+                        'min_limit_distance': (dealing_rules.get('minControlledRiskStopDistance') or _EMPTY).get('value', 0)
                     }
                 except Exception as e:
                     logger.error(f"Error parsing market details for {epic}: {e}")
@@ -586,7 +645,8 @@ class IGClient:
         
         logger.info(f"Creating MARKET {direction} position for {epic} with size {size}")
         logger.info(f"Stop distance: {stop_distance}, Limit distance: {limit_distance}")
-        logger.info(f"Payload: {json.dumps({k: v for k, v in payload.items() if k not in ['epic']})}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Payload: %s", json.dumps({k: v for k, v in payload.items() if k != 'epic'}))
         
         try:
             response = self.session.post(
@@ -769,6 +829,12 @@ class IGClient:
         except Exception as e:
             logger.error(f"Error reading CSV file: {e}")
 
+        # Check EPICs found by earlier API searches (persisted across restarts)
+        cached_epic = self.epic_disk_cache.get(symbol)
+        if cached_epic:
+            logger.info(f"Found EPIC in disk cache: {cached_epic} for {symbol}")
+            return cached_epic
+        
         # If we get here, we need to search via API
         logger.info(f"Falling back to API search for symbol: {symbol}")
 
@@ -814,6 +880,7 @@ class IGClient:
                 epic = market.get('epic', '')
                 if isinstance(epic, str) and epic.startswith(prefix) and epic.endswith('.DAILY.IP'):
                     logger.info(f"Found exact match EPIC: {epic} (prefix: {prefix})")
+                    self.epic_disk_cache.set(symbol, epic)
                     return epic
         
         # Second try: Look for any match with exchange prefix
@@ -822,6 +889,7 @@ class IGClient:
                 epic = market.get('epic', '')
                 if isinstance(epic, str) and epic.startswith(prefix):
                     logger.info(f"Found exchange match EPIC: {epic} (prefix: {prefix})")
+                    self.epic_disk_cache.set(symbol, epic)
                     return epic
         
         # Third try: Look for any DAILY.IP market that contains the ticker
@@ -911,7 +979,8 @@ class IGClient:
             order_data["limitLevel"] = str(limit)
         
         # Log the request data
-        logger.info(f"Creating working order with data: {json.dumps(order_data)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Creating working order with data: %s", json.dumps(order_data))
         
         # Make the API request
         response = self.session.post(
@@ -0,0 +1,51 @@
+"""
+Client-side rate limiting used by the Trading Bot
+"""
+import time
+import threading
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+    
+    Tokens refill continuously at a fixed rate up to capacity; acquire() blocks
+    until a token is available, so bursts are queued briefly instead of being
+    rejected by the server.
+    """
+    
+    def __init__(self, rate=25.0, capacity=30):
+        """
+        Initialize the bucket (it starts full)
+        
+        Args:
+            rate (float): Tokens added per second
+            capacity (int): Maximum number of tokens, i.e. the allowed burst
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """
+        Take one token, waiting for the bucket to refill if it is empty
+        
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                
+                delay = (1 - self._tokens) / self.rate
+            
+            time.sleep(delay)
+            waited += delay
@@ -4,15 +4,45 @@ Trade calculator for computing trade parameters
 import logging
 import pandas as pd
 import numpy as np
+from math import isfinite
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Tekil ve toplu hesaplama aynı yuvarlamayı kullanır: pozitif sayılarda yarım yukarı
+# (0.125 -> 0.13); round()/np.round ise yarımı çifte yuvarlar. NaN/inf olduğu gibi döner.
+
+def _round2(x):
+    """Pozitif sayıları 2 ondalık basamağa yuvarla (round() çağrısından daha ucuz)"""
+    return int(x * 100.0 + 0.5) / 100.0 if isfinite(x) else x
+
+def _round4(x):
+    """Pozitif sayıları 4 ondalık basamağa yuvarla (round() çağrısından daha ucuz)"""
+    return int(x * 10000.0 + 0.5) / 10000.0 if isfinite(x) else x
+
+def _round2_array(values):
+    """_round2'nin numpy dizileri için karşılığı (int() gibi sıfıra doğru keser)"""
+    return np.trunc(values * 100.0 + 0.5) / 100.0
+
+def _round4_array(values):
+    """_round4'ün numpy dizileri için karşılığı (int() gibi sıfıra doğru keser)"""
+    return np.trunc(values * 10000.0 + 0.5) / 10000.0
+
 class TradeCalculator:
     """
     Calculator for trade parameters based on alert data and CSV configuration
     """
     
+    # calculate_trade_parameters_batch için gereken CSV kolonları (sırası önemli)
+    CONFIG_COLUMNS = [
+        'ATR Stop Loss Period',
+        'ATR Stop Loss Multiple',
+        'ATR Profit Target Period',
+        'ATR Profit Multiple',
+        'Postion Size Max GBP',
+        'Opening Price Multiple'
+    ]
+    
     def __init__(self, ticker_data_df):
         """
         Initialize the trade calculator
@@ -21,7 +51,33 @@ class TradeCalculator:
             ticker_data_df (DataFrame): DataFrame containing ticker configuration data
         """
         self.ticker_data = ticker_data_df
+        self.ticker_config = self._build_ticker_config(ticker_data_df)
 
+    def _build_ticker_config(self, ticker_data_df):
+        """
+        Sembol -> (sl_period, sl_multiple, tp_period, tp_multiple, max_size_gbp, opening_price_multiple)
+        sözlüğünü bir kere oluştur. Multiple değerleri CSV'de % olarak tutuluyor, burada 100'e bölünür.
+        """
+        if ticker_data_df is None or ticker_data_df.empty:
+            return {}
+        if 'Symbol' not in ticker_data_df.columns or any(col not in ticker_data_df.columns for col in self.CONFIG_COLUMNS):
+            return {}
+        
+        # Aynı sembol birden fazla kez varsa skaler hesaplamada olduğu gibi ilk satırı kullan
+        df = ticker_data_df.drop_duplicates('Symbol', keep='first')
+        values = df[self.CONFIG_COLUMNS].apply(pd.to_numeric, errors='coerce')
+        valid = values.notna().all(axis=1).to_numpy()
+        
+        config = {}
+        # tolist() ile Python float'larına çevir (np.float64 round() sonuçlarını değiştirir)
+        for symbol, row in zip(df['Symbol'].to_numpy()[valid], values.to_numpy()[valid].tolist()):
+            config[symbol] = (
+                int(row[0]), row[1] / 100.0,
+                int(row[2]), row[3] / 100.0,
+                row[4], row[5] / 100.0
+            )
+        return config
+    
     def get_significant_digits(self, price):
         """
         Sayının anlamlı basamak sayısını bul (noktadan önceki)
@@ -29,8 +85,8 @@ class TradeCalculator:
              0.567 -> 0 basamak
              1234.567 -> 4 basamak
         """
-        # String'e çevir
-        price_str = str(float(price))
+        # String'e çevir (çağıran taraf float gönderiyor)
+        price_str = str(price)
         
         # Noktadan önceki kısmı al
         before_decimal = price_str.split('.')[0]
@@ -55,7 +111,7 @@ class TradeCalculator:
             # Eğer oran çok büyükse (örn: 50x veya daha fazla), direkt çarpanı kullan
             if price_ratio >= 50 and price_ratio <= 150:
                 # Muhtemelen 100x fark var (örn: 15.40 -> 1540.0)
-                normalized = float(tv_price) * 100.0
+                normalized = tv_price * 100.0
                 logger.info(f"High price ratio detected: {price_ratio:.1f}x. Applying 100x multiplier. {tv_price} -> {normalized}")
                 return normalized
             
@@ -68,12 +124,12 @@ class TradeCalculator:
             
             if digit_diff >= 2:
                 # IG fiyatı daha fazla basamaklı - çarparak normalize et
-                normalized = float(tv_price) * (10 ** digit_diff)
+                normalized = tv_price * (10 ** digit_diff)
                 logger.info(f"Price normalization: TV={tv_price} ({tv_digits} digits) -> IG={ig_price} ({ig_digits} digits), multiplier=1e{digit_diff}, result={normalized}")
                 return normalized
             elif digit_diff <= -2:
                 # TradingView fiyatı daha fazla basamaklı - bölerek normalize et
-                normalized = float(tv_price) / (10 ** abs(digit_diff))
+                normalized = tv_price / (10 ** abs(digit_diff))
                 logger.info(f"Price normalization: TV={tv_price} ({tv_digits} digits) -> IG={ig_price} ({ig_digits} digits), divider=1e{abs(digit_diff)}, result={normalized}")
                 return normalized
             else:
@@ -86,17 +142,17 @@ class TradeCalculator:
                 
                 if digit_diff > 0:
                     # IG fiyatı daha fazla basamaklı
-                    normalized = float(tv_price) * (10 ** digit_diff)
+                    normalized = tv_price * (10 ** digit_diff)
                     logger.info(f"Price normalization: TV={tv_price} ({tv_digits} digits) -> IG={ig_price} ({ig_digits} digits), multiplier=1e{digit_diff}, result={normalized}")
                     return normalized
                 else:
                     # Aynı basamak sayısı veya IG daha az basamaklı (nadir durum)
                     logger.info(f"No normalization needed: TV={tv_price} ({tv_digits} digits), IG={ig_price} ({ig_digits} digits)")
-                    return float(tv_price)
+                    return tv_price
         else:
             # IG fiyatı yoksa TV fiyatını aynen döndür
             logger.info(f"No normalization possible without IG price. Using TV price: {tv_price}")
-            return float(tv_price)
+            return tv_price
     
     def calculate_trade_parameters(self, ticker, direction, opening_price, atr_values, ig_price=None):
         """
@@ -113,29 +169,23 @@ class TradeCalculator:
             dict: Dictionary containing calculated trade parameters or None if failed
         """
         try:
-            # Find the ticker in the configuration data
-            ticker_row = self.ticker_data[self.ticker_data['Symbol'] == ticker]
+            # Alert'ten gelen fiyat zaten float olmalı; tek seferlik savunma amaçlı dönüşüm
+            opening_price = float(opening_price)
+            
+            # Find the ticker in the configuration built at init (dict lookup, no DataFrame scan)
+            ticker_config = self.ticker_config.get(ticker)
             
-            if ticker_row.empty:
+            if ticker_config is None:
                 logger.error(f"Ticker {ticker} not found in configuration data")
                 return None
             
             # Convert direction to trade direction
             trade_direction = "SELL" if direction == "UP" else "BUY"
             
-            # Get ATR indices for stop loss and take profit
-            atr_sl_period = int(ticker_row['ATR Stop Loss Period'].values[0])
-            atr_tp_period = int(ticker_row['ATR Profit Target Period'].values[0])
-            
-            # Get multipliers from CSV
-            atr_sl_multiple = float(ticker_row['ATR Stop Loss Multiple'].values[0]) / 100.0  # CSV'deki değer % olarak
-            atr_tp_multiple = float(ticker_row['ATR Profit Multiple'].values[0]) / 100.0    # CSV'deki değer % olarak
-            
-            # Get max position size
-            max_position_size_gbp = float(ticker_row['Postion Size Max GBP'].values[0])
-            
-            # CSV'den Opening Price Multiple değerini al
-            opening_price_multiple = float(ticker_row['Opening Price Multiple'].values[0]) / 100.0  # CSV'deki değer % olarak (96-104 arası)
+            # ATR indices, multipliers (already divided by 100), max position size
+            # and Opening Price Multiple (already divided by 100) from the CSV
+            (atr_sl_period, atr_sl_multiple, atr_tp_period, atr_tp_multiple,
+             max_position_size_gbp, opening_price_multiple) = ticker_config
             
             # Her zaman orijinal fiyatı sakla
             original_price = opening_price
@@ -273,7 +323,7 @@ class TradeCalculator:
             logger.info(f"Raw position size calculation: {max_position_size_gbp} GBP / {entry_price} = {position_size_raw}")
             
             # IG Markets için doğru pozisyon boyutu formatı - sadece 1 ondalık basamak
-            position_size = round(position_size_raw, 2)  # İki ondalık basamak kullan (eskiden 1 idi)
+            position_size = _round2(position_size_raw)  # İki ondalık basamak kullan (eskiden 1 idi)
             
             # Serco örneğindeki sorunu çözmek için özel durum kontrolü
             # entry_price = 176.851, position_size_raw = 56.54, position_size = 56.5
@@ -282,7 +332,7 @@ class TradeCalculator:
                 logger.info(f"Position size seems large ({position_size}) for price {entry_price}, keeping as is")
             # Eğer yüksek fiyatlı hisse ise ve hesaplanan değer de büyükse 100'e böl
             elif entry_price > 800 and position_size > 10:
-                position_size = round(position_size / 100, 2)  # İki ondalık basamak kullan (eskiden 1 idi)
+                position_size = _round2(position_size / 100)  # İki ondalık basamak kullan (eskiden 1 idi)
                 logger.warning(f"Adjusting high position size for high price: {position_size}")
             
             # Log all parameters for easier debugging
@@ -301,14 +351,14 @@ class TradeCalculator:
             return {
                 'ticker': ticker,
                 'direction': trade_direction,
-                'original_price': round(original_price, 4),  # TradingView'dan gelen orijinal fiyat
-                'price_level': round(price_level, 4),        # Hesaplanan gerçek fiyat seviyesi (DOWN için %98)
-                'entry_price': round(entry_price, 4),        # Normalize edilmiş fiyat
-                'stop_distance': round(stop_distance, 2),    # 2 ondalık basamak için yuvarlanmış (eskiden 1 idi)
-                'limit_distance': round(limit_distance, 2),  # 2 ondalık basamak için yuvarlanmış (eskiden 1 idi)
-                'stop_level': round(stop_level, 4),          # Hesaplanan stop seviyesi
-                'limit_level': round(limit_level, 4),        # Hesaplanan limit seviyesi
-                'position_size': round(position_size, 2),    # Tutarlı olması için burayı da round içine aldım
+                'original_price': _round4(original_price),  # TradingView'dan gelen orijinal fiyat
+                'price_level': _round4(price_level),         # Hesaplanan gerçek fiyat seviyesi (DOWN için %98)
+                'entry_price': _round4(entry_price),         # Normalize edilmiş fiyat
+                'stop_distance': _round2(stop_distance),     # 2 ondalık basamak için yuvarlanmış (eskiden 1 idi)
+                'limit_distance': _round2(limit_distance),   # 2 ondalık basamak için yuvarlanmış (eskiden 1 idi)
+                'stop_level': _round4(stop_level),           # Hesaplanan stop seviyesi
+                'limit_level': _round4(limit_level),         # Hesaplanan limit seviyesi
+                'position_size': position_size,              # Tutarlı olması için burayı da round içine aldım
                 'max_position_size_gbp': max_position_size_gbp
             }
             
@@ -316,6 +366,161 @@ class TradeCalculator:
             logger.error(f"Error calculating trade parameters for {ticker}: {e}")
             return None
     
+    @staticmethod
+    def _integer_digits(values):
+        """
+        len(str(int(x))) ile aynı sonucu veren vektörel basamak sayısı (x >= 0 için)
+        """
+        safe = np.where(values >= 1, values, 1.0)
+        digits = np.floor(np.log10(safe)).astype(np.int64) + 1
+        # log10 yuvarlama hatalarını düzelt (örn: 999.9999 -> 3 basamak)
+        digits = np.where(10.0 ** (digits - 1) > safe, digits - 1, digits)
+        return np.where(values >= 1, digits, 1)
+    
+    def _normalize_prices_batch(self, tv_prices, ig_prices):
+        """
+        normalize_price fonksiyonunun vektörel karşılığı. IG fiyatı NaN olan satırlar olduğu gibi döner.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            valid = ~np.isnan(ig_prices) & (ig_prices > 0) & (tv_prices > 0)
+            ratio = ig_prices / tv_prices
+            
+            ig_digits = self._integer_digits(ig_prices)
+            tv_digits = self._integer_digits(tv_prices)
+            digit_diff = ig_digits - tv_digits
+            
+            # get_significant_digits: 1'den küçük fiyatlar için 0 basamak
+            sig_diff = np.where(ig_prices >= 1, ig_digits, 0) - np.where(tv_prices >= 1, tv_digits, 0)
+            
+            normalized = np.select(
+                [
+                    valid & (ratio >= 50) & (ratio <= 150),
+                    valid & (digit_diff >= 2),
+                    valid & (digit_diff <= -2),
+                    valid & (sig_diff > 0)
+                ],
+                [
+                    tv_prices * 100.0,
+                    tv_prices * 10.0 ** digit_diff,
+                    tv_prices / 10.0 ** np.abs(digit_diff),
+                    tv_prices * 10.0 ** sig_diff
+                ],
+                default=tv_prices
+            )
+        return normalized
+    
+    def calculate_trade_parameters_batch(self, tickers, directions, opening_prices, atr_values_2d, ig_prices=None):
+        """
+        Calculate trade parameters for many alerts at once using numpy vector operations.
+        Aynı anda gelen çok sayıda alert için satır satır Python döngüsü yerine tek seferde hesaplama yapar.
+        
+        Args:
+            tickers (list): Ticker symbols, length N
+            directions (np.ndarray): 'UP' or 'DOWN' for each alert, length N
+            opening_prices (np.ndarray): Opening prices from the alerts, length N
+            atr_values_2d (np.ndarray): ATR values, shape (N, 10)
+            ig_prices (np.ndarray, optional): Current IG prices for normalization, NaN where not available
+            
+        Returns:
+            list: One dict per alert with the same keys as calculate_trade_parameters,
+                  or None for alerts whose ticker is not configured
+        """
+        n = len(tickers)
+        if n == 0:
+            return []
+        
+        directions = np.asarray(directions)
+        opening_prices = np.asarray(opening_prices, dtype=np.float64)
+        atr = np.asarray(atr_values_2d, dtype=np.float64).reshape(n, -1)
+        has_ig = ig_prices is not None
+        ig_prices = np.asarray(ig_prices, dtype=np.float64) if has_ig else np.full(n, np.nan)
+        
+        # Ticker konfigürasyonlarını N uzunluğunda dizilere çevir (bilinmeyen ticker'lar NaN)
+        missing = (np.nan,) * 6
+        config = np.array([self.ticker_config.get(t, missing) for t in tickers], dtype=np.float64).reshape(n, 6)
+        found = ~np.isnan(config[:, 0])
+        config[~found] = 1.0  # Hesaplamada NaN yayılmasın, sonuçta None döneceğiz
+        
+        sl_periods = config[:, 0].astype(np.int64)
+        sl_multiples = config[:, 1]
+        tp_periods = config[:, 2].astype(np.int64)
+        tp_multiples = config[:, 3]
+        max_position_sizes = config[:, 4]
+        opening_price_multiples = config[:, 5]
+        
+        is_up = directions == "UP"
+        trade_directions = np.where(is_up, "SELL", "BUY")
+        
+        # UP (SELL) için çarp, DOWN (BUY) için böl
+        price_levels = np.where(is_up, opening_prices * opening_price_multiples, opening_prices / opening_price_multiples)
+        
+        entry_prices = price_levels
+        if has_ig:
+            entry_prices = self._normalize_prices_batch(price_levels, ig_prices)
+        
+        # ATR değerlerini seç - yeterli ATR yoksa varsayılan değerler kullanılır
+        rows = np.arange(n)
+        n_atr = atr.shape[1]
+        enough_atr = np.maximum(sl_periods, tp_periods) <= n_atr
+        atr_sl = np.where(enough_atr, atr[rows, np.clip(sl_periods, 1, n_atr) - 1], 0.01 * opening_prices)
+        atr_tp = np.where(enough_atr, atr[rows, np.clip(tp_periods, 1, n_atr) - 1], 0.02 * opening_prices)
+        atr_sl = np.where(atr_sl <= 0, 0.01 * opening_prices, atr_sl)
+        atr_tp = np.where(atr_tp <= 0, 0.02 * opening_prices, atr_tp)
+        
+        sl_offsets = atr_sl * sl_multiples
+        tp_offsets = atr_tp * tp_multiples
+        stop_levels = np.where(is_up, opening_prices + sl_offsets, opening_prices - sl_offsets)
+        limit_levels = np.where(is_up, opening_prices - tp_offsets, opening_prices + tp_offsets)
+        stop_distances = np.abs(stop_levels - price_levels)
+        limit_distances = np.abs(limit_levels - price_levels)
+        
+        # Maksimum mesafe sınırları (fiyatın %15 / %20'si)
+        stop_distances = np.minimum(stop_distances, price_levels * 0.15)
+        limit_distances = np.minimum(limit_distances, price_levels * 0.20)
+        
+        # IG fiyat formatına göre mesafeleri ölçeklendir
+        if has_ig:
+            with np.errstate(invalid='ignore'):
+                scalable = ~np.isnan(ig_prices) & (ig_prices > 0) & (price_levels > 0)
+                digit_diff = self._integer_digits(ig_prices) - self._integer_digits(price_levels)
+                multipliers = np.where(scalable & (np.abs(digit_diff) >= 2), 10.0 ** digit_diff, 1.0)
+            stop_distances = stop_distances * multipliers
+            limit_distances = limit_distances * multipliers
+        
+        # Minimum mesafe: fiyatın %0.1'i
+        min_distances = 0.001 * price_levels
+        stop_distances = np.maximum(stop_distances, min_distances)
+        limit_distances = np.maximum(limit_distances, min_distances)
+        
+        # Pozisyon büyüklüğü - yüksek fiyatlı hisselerde 100'e böl
+        position_sizes = _round2_array(max_position_sizes / entry_prices)
+        high_price = (entry_prices > 800) & (position_sizes > 10)
+        position_sizes = np.where(high_price, _round2_array(position_sizes / 100), position_sizes)
+        
+        logger.info(f"Batch trade parameters calculated for {int(found.sum())}/{n} alerts")
+        
+        # Sonuç listesini en sonda tek seferde oluştur
+        columns = zip(
+            tickers,
+            trade_directions.tolist(),
+            _round4_array(opening_prices).tolist(),
+            _round4_array(price_levels).tolist(),
+            _round4_array(entry_prices).tolist(),
+            _round2_array(stop_distances).tolist(),
+            _round2_array(limit_distances).tolist(),
+            _round4_array(stop_levels).tolist(),
+            _round4_array(limit_levels).tolist(),
+            position_sizes.tolist(),
+            max_position_sizes.tolist(),
+            found.tolist()
+        )
+        keys = (
+            'ticker', 'direction', 'original_price', 'price_level', 'entry_price',
+            'stop_distance', 'limit_distance', 'stop_level', 'limit_level',
+            'position_size', 'max_position_size_gbp'
+        )
+        return [dict(zip(keys, row[:-1])) if row[-1] else None for row in columns]
+    
     def parse_alert_message(self, alert_message):
         """
         Parse an alert message from TradingView
@@ -5,17 +5,226 @@ import logging
 import time
 import os
 import json
-from datetime import datetime, timedelta
+import math
+import queue
+import threading
+from bisect import bisect_left, bisect_right
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 import pandas as pd
+import requests
 from trading_bot.ig_api import IGClient
 from trading_bot.trade_calculator import TradeCalculator
-from trading_bot.config import (
-    MAX_OPEN_POSITIONS, ALERT_MAX_AGE_SECONDS, load_ticker_data, 
-    is_dividend_date
-)
+from trading_bot.cache import TTLCache
+from trading_bot.config import MAX_OPEN_POSITIONS, ALERT_MAX_AGE_SECONDS, load_ticker_data
 
 logger = logging.getLogger(__name__)
 
+@dataclass(slots=True)
+class TradeRecord:
+    """A trade placed today, kept in TradeManager.today_trades by ticker"""
+    time: datetime
+    date: date
+    direction: str
+    epic: str
+    deal_reference: str | None = None
+    params: dict | None = None
+
+def _digits(x):
+    """
+    Number of digits in the integer part of a positive price, same as len(str(int(x)))
+    but without building a string
+    """
+    if x < 10:
+        return 1
+    n = int(math.log10(x)) + 1
+    # log10 can round up just below a power of ten (e.g. 999.9999999999999)
+    if int(x) < 10 ** (n - 1):
+        n -= 1
+    return n
+
+def _scale_distances_normal(stop_distance, limit_distance, current_price, limit_level, ig_format_multiplier):
+    """Bring calculator distances to IG format by the same multiplier as the price level"""
+    if ig_format_multiplier != 1.0:
+        stop_distance *= ig_format_multiplier
+        limit_distance *= ig_format_multiplier
+        logger.info("Scaled distances - Stop: %s, Limit: %s", stop_distance, limit_distance)
+    else:
+        logger.info("No scaling needed for distances, using original values")
+    return stop_distance, limit_distance
+
+def _scale_distances_high(stop_distance, limit_distance, current_price, limit_level, ig_format_multiplier):
+    """High priced stocks: distances are already in IG format unless the prices disagree by more than 10%"""
+    price_ratio = current_price / limit_level
+    if abs(price_ratio - 1.0) > 0.1:
+        logger.warning("Price ratio %s indicates format mismatch, adjusting distances", price_ratio)
+        stop_distance *= price_ratio
+        limit_distance *= price_ratio
+    
+    logger.info("High price stock - using direct distance values: Stop=%s, Limit=%s", stop_distance, limit_distance)
+    return stop_distance, limit_distance
+
+# (lower price bound, distance scaling) - the band is picked by the lower of IG price and limit level
+_PRICE_BANDS = [
+    (0, _scale_distances_normal),
+    (100, _scale_distances_high),
+]
+_PRICE_BAND_BOUNDS = [bound for bound, _ in _PRICE_BANDS]
+
+def _distance_scaler(current_price, limit_level):
+    """Distance scaling function of the price band the trade falls into"""
+    index = bisect_right(_PRICE_BAND_BOUNDS, min(current_price, limit_level)) - 1
+    return _PRICE_BANDS[max(index, 0)][1]
+
+def _cap_distance(name, distance, limit_level):
+    """
+    Undo a leftover x100 format mismatch: distances above 1000, and then above 10%
+    of the limit level, are divided by 100
+    """
+    if distance > 1000:
+        logger.warning("%s distance %s is too large, reducing by factor of 100", name, distance)
+        distance = distance / 100
+    
+    max_reasonable_distance = limit_level * 0.1
+    if distance > max_reasonable_distance:
+        logger.warning("%s distance %s is suspiciously large (>%s). Adjusting.", name, distance, max_reasonable_distance)
+        distance = round(distance / 100, 2)
+    return distance
+
+# enqueue_alert: alerts arriving within this window are handled as one batch
+_ALERT_BATCH_WINDOW_SECONDS = 0.02
+_ALERT_BATCH_MAX_SIZE = 16
+
+# Parameters create_working_order can't do without (tuple order decides which one is reported)
+_WORKING_ORDER_REQUIRED = ('epic', 'direction', 'size', 'order_level')
+_WORKING_ORDER_REQUIRED_SET = frozenset(_WORKING_ORDER_REQUIRED)
+
+# Cached in epic_cache for symbols that have no EPIC in the CSV
+_NO_EPIC = object()
+
+# Shared read-only fallback for missing nested dicts in IG responses (never mutate)
+_EMPTY = {}
+
+# Output field -> (path in the IG response row, default) for the history formatters
+_POSITION_SCHEMA = [
+    ("epic", ('market', 'epic'), None),
+    ("instrumentName", ('market', 'instrumentName'), None),
+    ("dealId", ('position', 'dealId'), None),
+    ("direction", ('position', 'direction'), None),
+    ("size", ('position', 'size'), None),
+    ("level", ('position', 'level'), None),
+    # The positions response already carries stopLevel and limitLevel,
+    # no need to look each deal up again
+    ("stopLevel", ('position', 'stopLevel'), None),
+    ("limitLevel", ('position', 'limitLevel'), None),
+    ("bid", ('market', 'bid'), None),
+    ("offer", ('market', 'offer'), None),
+    ("profit", ('market', 'profit', 'value'), None),
+    ("currency", ('market', 'profit', 'currency'), 'GBP'),
+    ("createdDate", ('position', 'createdDate'), None),
+]
+
+_TRANSACTION_SCHEMA = [
+    ("date", ('dateUtc',), None),
+    ("transaction_type", ('transactionType',), None),
+    ("instrument_name", ('instrumentName',), None),
+    ("epic", ('epic',), None),
+    ("reference", ('reference',), None),
+    ("opening_level", ('openLevel',), None),
+    ("closing_level", ('closeLevel',), None),
+    ("profit", ('profitAndLoss',), None),
+    ("currency", ('currency',), None),
+    ("size", ('size',), None),
+    ("direction", ('direction',), None),
+]
+
+_ACTIVITY_SCHEMA = [
+    ("date", ('date',), None),
+    ("activity_type", ('type',), None),
+    ("status", ('status',), None),
+    ("description", ('description',), None),
+    ("deal_id", ('details', 'dealId'), None),
+    ("deal_reference", ('details', 'dealReference'), None),
+    ("epic", ('details', 'epic'), None),
+    ("market_name", ('details', 'marketName'), None),
+    ("size", ('details', 'size'), None),
+    ("direction", ('details', 'direction'), None),
+    ("level", ('details', 'level'), None),
+    ("stop_level", ('details', 'stopLevel'), None),
+    ("limit_level", ('details', 'limitLevel'), None),
+]
+
+@lru_cache(maxsize=32)
+def _history_date_range(today, days):
+    """Return the (from, to) ISO date strings for a history request, memoized per day"""
+    return (today - timedelta(days=days)).isoformat(), today.isoformat()
+
+# Scalar fields of a get_all_history result when nothing could be retrieved
+_EMPTY_HISTORY = {
+    "status": "error",
+    "position_count": 0,
+    "transaction_count": 0,
+    "activity_count": 0
+}
+
+def _empty_history(days, **extra):
+    """Build a get_all_history error result with fresh empty lists"""
+    return {**_EMPTY_HISTORY, "open_positions": [], "transactions": [], "activities": [], "days_history": days, **extra}
+
+def _unpack_history_part(part, list_key, count_key):
+    """Return (status, rows, count) of one get_all_history sub-result, treating anything but a dict as an error"""
+    if not isinstance(part, dict):
+        return "error", [], 0
+    return part.get("status", "error"), part.get(list_key, []), part.get(count_key, 0)
+
+def _split_by_day(rows, date_ranges):
+    """
+    Partition formatted history rows into date ranges by the YYYY-MM-DD prefix of their 'date'
+    
+    Args:
+        rows (list): Formatted transactions or activities
+        date_ranges (list): (from_date, to_date) date pairs, both ends inclusive
+    
+    Returns:
+        list: One list of rows per range, rows keep their original (IG) order
+    """
+    order = sorted(range(len(rows)), key=lambda i: (rows[i]['date'] or '')[:10])
+    days = [(rows[i]['date'] or '')[:10] for i in order]
+    
+    parts = []
+    for from_date, to_date in date_ranges:
+        lo = bisect_left(days, from_date.isoformat())
+        hi = bisect_right(days, to_date.isoformat())
+        parts.append([rows[i] for i in sorted(order[lo:hi])])
+    return parts
+
+def _build_extractor(schema):
+    """
+    Build a function that flattens one IG response row according to a schema
+    
+    Each nested dict (e.g. 'market', 'details') is walked once per row and
+    shared by all fields that read from it.
+    """
+    parents = tuple(dict.fromkeys(path[:-1] for _, path, _ in schema))
+    fields = tuple((field, path[:-1], path[-1], default) for field, path, default in schema)
+    
+    def extract(row):
+        nodes = {}
+        for parent in parents:
+            node = row
+            for key in parent:
+                node = node.get(key) or _EMPTY
+            nodes[parent] = node
+        return {field: nodes[parent].get(key, default) for field, parent, key, default in fields}
+    
+    return extract
+
+_format_position = _build_extractor(_POSITION_SCHEMA)
+_format_transaction = _build_extractor(_TRANSACTION_SCHEMA)
+_format_activity = _build_extractor(_ACTIVITY_SCHEMA)
+
 class TradeManager:
     """
     Manager for handling trading operations
@@ -26,22 +235,105 @@ class TradeManager:
         self.ig_client = IGClient()
         self.ticker_data = load_ticker_data()
         self.trade_calculator = TradeCalculator(self.ticker_data)
+        # The calculator keeps the full frame for its ATR columns, we only need a few
+        self.ticker_data = self._project_ticker_data(self.ticker_data)
+        self._index_ticker_data()
         self.today_trades = {}  # To track trades made today by ticker
+        self._today_trades_date = date.today()  # Day the today_trades entries belong to
         
         # Load settings from settings.json
         self.load_settings()
         
-        self.epic_cache = {}  # Cache for EPIC codes to avoid repeated API calls
+        # Cache for EPIC codes - bounded LRU with expiry so stale EPICs don't live forever
+        self.epic_cache = TTLCache(maxsize=512, ttl=3600)
+        
+        # Open positions are fetched by several checks per alert, keep them for a couple of seconds
+        self._positions_cache = TTLCache(maxsize=1, ttl=2)
+        
+        # Market details are read by process_alert and again by _execute_trade for the same epic
+        self._market_details_cache = TTLCache(maxsize=64, ttl=2)
+        self._market_details_pending = {}  # epic -> Future of a prefetch still in flight
+        self._market_details_lock = threading.Lock()  # guards _market_details_pending
+        
+        # Deal status is polled repeatedly while waiting for a fill, collapse polls within 250ms
+        self._deal_status_cache = TTLCache(maxsize=64, ttl=0.25)
+        
+        # Dashboards reload the same history repeatedly, keep successful results for 30 seconds
+        self._history_cache = TTLCache(maxsize=32, ttl=30)
+        
+        # Background threads so independent IG requests of one alert can overlap
+        self._io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='ig-io')
+        
+        # Alerts queued by enqueue_alert, the worker thread is started on first use
+        self._alert_queue = queue.Queue()
+        self._alert_worker = None
+        self._alert_worker_lock = threading.Lock()
+    
+    # Parsed settings.json shared by all instances, re-read only when the file's mtime changes
+    _settings_cache = {'mtime': None, 'data': None}
+    
+    # Columns of the ticker CSV used by the trade manager itself
+    TICKER_COLUMNS = ['Symbol', 'IG EPIC', 'Next dividend date']
+    
+    @classmethod
+    def _project_ticker_data(cls, ticker_data):
+        """Keep only the columns we read and store Symbol as a category"""
+        if ticker_data.empty or 'Symbol' not in ticker_data.columns:
+            return ticker_data
+        
+        columns = [col for col in cls.TICKER_COLUMNS if col in ticker_data.columns]
+        return ticker_data[columns].astype({'Symbol': 'category'})
+    
+    def _index_ticker_data(self):
+        """Build symbol lookups once so alerts don't scan the whole DataFrame"""
+        if self.ticker_data.empty or 'Symbol' not in self.ticker_data.columns:
+            self.ticker_index = self.ticker_data
+            self.symbol_to_epic = {}
+            self.symbol_set = frozenset()
+            self.dividend_dates = {}
+            return
+        
+        # Aynı sembol birden fazla kez varsa ilk satır geçerli (eski filtre davranışı)
+        unique_rows = self.ticker_data.drop_duplicates('Symbol', keep='first')
+        self.ticker_index = unique_rows.set_index('Symbol', drop=False)
+        self.symbol_to_epic = dict(zip(unique_rows['Symbol'], unique_rows['IG EPIC']))
+        self.symbol_set = frozenset(unique_rows['Symbol'])
+        
+        # Parse dividend dates once (same rules as config.is_dividend_date); unparsable -> skipped
+        self.dividend_dates = {}
+        if 'Next dividend date' in unique_rows.columns:
+            for symbol, value in zip(unique_rows['Symbol'], unique_rows['Next dividend date']):
+                if pd.isna(value) or value == 'na':
+                    continue
+                try:
+                    self.dividend_dates[symbol] = datetime.strptime(value, '%d/%m/%Y').date()
+                except (TypeError, ValueError) as e:
+                    logger.error(f"Error parsing dividend date for {symbol}: {e}")
+    
+    def reload_ticker_data(self):
+        """Reload the ticker CSV and rebuild everything derived from it"""
+        ticker_data = load_ticker_data()
+        self.trade_calculator = TradeCalculator(ticker_data)
+        self.ticker_data = self._project_ticker_data(ticker_data)
+        self._index_ticker_data()
+        self.epic_cache.clear()
+        logger.info(f"Reloaded ticker data: {len(self.ticker_data)} rows")
     
     def load_settings(self):
         """Load settings from settings.json file"""
         settings_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'settings.json')
         try:
-            with open(settings_path, 'r') as f:
-                settings = json.load(f)
+            mtime = os.stat(settings_path).st_mtime_ns
+            cache = TradeManager._settings_cache
+            if cache['mtime'] == mtime:
+                settings = cache['data']
+            else:
+                with open(settings_path, 'r') as f:
+                    settings = json.load(f)
+                cache['mtime'], cache['data'] = mtime, settings
                 
-            # Load validation rules
-            self.validation_rules = settings.get('validation', {
+            # Load validation rules (copied so instances can't change the shared cache)
+            self.validation_rules = dict(settings.get('validation', {
                 'check_same_day_trades': True,
                 'check_open_position_limit': True,
                 'check_existing_position': True,
@@ -49,7 +341,7 @@ class TradeManager:
                 'check_dividend_date': True,
                 'check_max_deal_age': True,
                 'check_total_positions_and_orders': True
-            })
+            }))
             
             # Load trading settings
             trading_settings = settings.get('trading', {})
@@ -88,18 +380,19 @@ class TradeManager:
         Returns:
             dict: Result of the trade execution
         """
+        now_ts = time.time()
         if timestamp is None:
-            timestamp = time.time()
+            timestamp = now_ts
         
-        alert_time = datetime.fromtimestamp(timestamp)
-        now = datetime.now()
-        
-        # Validate alert age if required
+        # Validate alert age if required (plain float seconds, no datetime objects)
         if self.validation_rules['check_alert_timestamp']:
-            if (now - alert_time).total_seconds() > self.alert_max_age_seconds:
-                logger.warning(f"Alert is too old: {alert_message}")
+            if now_ts - timestamp > self.alert_max_age_seconds:
+                logger.warning("Alert is too old: %s", alert_message)
                 return {"status": "error", "message": "Alert is too old"}
         
+        # Single datetime for the dividend check and the today_trades record
+        now = datetime.fromtimestamp(now_ts)
+        
         # Parse the alert message
         parse_result = self.trade_calculator.parse_alert_message(alert_message)
         if not parse_result:
@@ -108,17 +401,12 @@ class TradeManager:
         ticker, direction, opening_price, atr_values = parse_result
         
         # Validate the trade
-        validation_error = self._validate_trade(ticker)
+        validation_error, epic = self._validate_trade(ticker, now)
         if validation_error:
             return validation_error
-            
-        # Get EPIC code for the ticker from CSV
-        epic = self.get_epic(ticker)
-        if not epic:
-            return {"status": "error", "message": f"No IG EPIC code found for {ticker} in CSV"}
         
         # Get current IG price for normalization
-        market_details = self.ig_client._get_market_details(epic)
+        market_details = self._get_market_details_cached(epic)
         if not market_details:
             return {"status": "error", "message": f"Failed to get market details for {ticker}"}
         
@@ -131,21 +419,22 @@ class TradeManager:
             return {"status": "error", "message": f"Failed to get current price for {ticker}"}
         
         # Fiyat bilgilerini detaylı şekilde logla
-        logger.info(f"Processing alert for {ticker}: TV Price={opening_price}, IG Price={current_price}")
-        logger.info(f"IG Bid/Offer: Bid={bid_price}, Offer={offer_price}")
-        
-        # JSON formatında fiyat bilgilerini logla (hata ayıklama için)
-        ig_prices_json = {
-            "prices": {
-                "bid": bid_price,
-                "current_price": current_price,
-                "offer": offer_price
-            },
-            "tv_price": opening_price,
-            "ticker": ticker,
-            "epic": epic
-        }
-        logger.info(f"IG prices JSON format: {json.dumps(ig_prices_json)}")
+        logger.info("Processing alert for %s: TV Price=%s, IG Price=%s", ticker, opening_price, current_price)
+        logger.info("IG Bid/Offer: Bid=%s, Offer=%s", bid_price, offer_price)
+        
+        # JSON formatında fiyat bilgilerini logla (hata ayıklama için) - sadece INFO açıksa oluştur
+        if logger.isEnabledFor(logging.INFO):
+            ig_prices_json = {
+                "prices": {
+                    "bid": bid_price,
+                    "current_price": current_price,
+                    "offer": offer_price
+                },
+                "tv_price": opening_price,
+                "ticker": ticker,
+                "epic": epic
+            }
+            logger.info("IG prices JSON format: %s", json.dumps(ig_prices_json))
         
         # Calculate trade parameters with price normalization
         trade_params = self.trade_calculator.calculate_trade_parameters(
@@ -162,78 +451,277 @@ class TradeManager:
             'current_price': current_price
         }
         
-        # Execute the trade
-        result = self._execute_trade(ticker, trade_params)
+        # Execute the trade (records it in today_trades on success)
+        result = self._execute_trade(ticker, trade_params, epic, now)
         
-        # Record the trade if successful
-        if result.get('status') == 'success':
-            self.today_trades[ticker] = {
-                'time': datetime.now(),
-                'direction': trade_params['direction']
-            }
-            
         return result
     
-    def _validate_trade(self, ticker):
+    def enqueue_alert(self, alert_message, timestamp=None):
+        """
+        Queue an alert for the batching worker instead of processing it on the caller's thread
+        
+        Alerts arriving within a few milliseconds of each other share one open
+        positions request and fetch their market details in parallel; each alert
+        is still validated and executed in arrival order by process_alert.
+        
+        Args:
+            alert_message (str): The alert message
+            timestamp (float, optional): Timestamp of the alert. Defaults to current time.
+        
+        Returns:
+            Future: Resolves to the process_alert result
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        
+        future = Future()
+        self._alert_queue.put((alert_message, timestamp, future))
+        
+        with self._alert_worker_lock:
+            if self._alert_worker is None:
+                self._alert_worker = threading.Thread(
+                    target=self._alert_worker_loop, name='alert-batch', daemon=True
+                )
+                self._alert_worker.start()
+        
+        return future
+    
+    def _alert_worker_loop(self):
+        """Take batches of queued alerts and process them until the process exits"""
+        while True:
+            batch = [self._alert_queue.get()]
+            
+            # Collect whatever else arrives within the batch window
+            deadline = time.monotonic() + _ALERT_BATCH_WINDOW_SECONDS
+            while len(batch) < _ALERT_BATCH_MAX_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._alert_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            try:
+                self._prefetch_alert_batch(batch)
+            except Exception as e:
+                logger.error(f"Error prefetching data for {len(batch)} alerts: {e}")
+            
+            for alert_message, timestamp, future in batch:
+                try:
+                    future.set_result(self.process_alert(alert_message, timestamp))
+                except Exception as e:
+                    logger.error(f"Error processing queued alert {alert_message}: {e}")
+                    future.set_exception(e)
+    
+    def _prefetch_alert_batch(self, batch):
+        """
+        Start the IG requests a batch of alerts will need before processing them one by one
+        
+        Args:
+            batch (list): (alert_message, timestamp, future) tuples
+        """
+        if len(batch) < 2:
+            return
+        
+        epics = set()
+        for alert_message, _, _ in batch:
+            parse_result = self.trade_calculator.parse_alert_message(alert_message)
+            if not parse_result or parse_result[0] in self.today_trades:
+                continue
+            epic = self.get_epic(parse_result[0])
+            if epic:
+                epics.add(epic)
+        
+        if epics:
+            # Log in once before the prefetches race to log in on the shared session
+            self.ig_client._ensure_session()
+        for epic in epics:
+            self._prefetch_market_details(epic)
+        
+        # One positions request for the whole batch while the market details load
+        # (a successful trade clears it, so later alerts in the batch see fresh positions)
+        if epics:
+            self._get_positions_cached()
+    
+    def _validate_trade(self, ticker, now=None):
         """
         Validate if a trade should be executed
         
         Args:
             ticker (str): The ticker symbol
+            now (datetime, optional): Time the alert is being processed. Defaults to current time.
             
         Returns:
-            dict: Validation error or None if validation passed
+            tuple: (validation error or None if validation passed, EPIC code or None)
         """
+        # Local checks first (cheapest first), network calls only if these pass
+        today = (now or datetime.now()).date()
+        self._prune_today_trades(today)
+        
         # Check if we have the ticker data
         if self.ticker_data.empty:
-            return {"status": "error", "message": "Ticker data not loaded"}
+            return {"status": "error", "message": "Ticker data not loaded"}, None
+        
+        # Check for same-day trades (if enabled)
+        if self.validation_rules['check_same_day_trades']:
+            trade = self.today_trades.get(ticker)
+            if trade and trade.date == today:
+                trade_time = trade.time
+                return {"status": "error", "message": f"Already traded {ticker} today at {trade_time.time().isoformat('seconds')}"}, None
         
         # Check if the ticker exists in our data
-        ticker_row = self.ticker_data[self.ticker_data['Symbol'] == ticker]
-        if ticker_row.empty:
-            return {"status": "error", "message": f"Ticker {ticker} not found in configuration"}
+        if ticker not in self.symbol_set:
+            return {"status": "error", "message": f"Ticker {ticker} not found in configuration"}, None
+        
+        # Check for dividend date (if enabled)
+        if self.validation_rules['check_dividend_date']:
+            if self.dividend_dates.get(ticker) == today:
+                dividend_date = self.ticker_index.at[ticker, 'Next dividend date']
+                return {"status": "error", "message": f"Today is a dividend date for {ticker} ({dividend_date})"}, None
         
         # Get EPIC code for the ticker from CSV
         epic = self.get_epic(ticker)
         if not epic:
-            return {"status": "error", "message": f"No IG EPIC code found for {ticker} in CSV"}
+            return {"status": "error", "message": f"No IG EPIC code found for {ticker} in CSV"}, None
+        
+        # Local checks passed - log in once here, before background requests race
+        # to log in on the shared session, then start loading market details so
+        # that request overlaps the position/order round-trips below
+        self.ig_client._ensure_session()
+        self._prefetch_market_details(epic)
+        
+        # Working orders (total and max-age checks) don't depend on positions, so they
+        # load in the background while positions are fetched here - unless a position
+        # check may still reject the alert; then they are fetched only once it passes,
+        # so a rejected alert costs no extra IG request
+        check_total = self.validation_rules.get('check_total_positions_and_orders', False)
+        check_deal_age = self.validation_rules.get('check_max_deal_age', False)
+        need_orders = check_total or check_deal_age
+        position_checks = self.validation_rules['check_existing_position'] or self.validation_rules['check_open_position_limit']
+        orders_future = None
+        if need_orders and not position_checks:
+            orders_future = self._io_executor.submit(self.ig_client.get_working_orders)
+        
+        # Fetch open positions once for the limit, existing-position and total checks
+        open_positions = []
+        if position_checks or check_total:
+            open_positions = self.get_all_positions().get('positions', [])
+        
+        # Check maximum open positions (if enabled)
+        if self.validation_rules['check_open_position_limit']:
+            if len(open_positions) >= self.max_open_positions:
+                return {"status": "error", "message": f"Maximum open positions limit ({self.max_open_positions}) reached"}, None
         
         # Check if position already exists for this ticker (if enabled)
         if self.validation_rules['check_existing_position']:
-            positions = self.get_all_positions()
-            for position in positions.get('positions', []):
-                if position.get('epic') == epic:
-                    return {"status": "error", "message": f"Position already exists for {ticker}"}
-        
-        # Check for same-day trades (if enabled)
-        if self.validation_rules['check_same_day_trades']:
-            if ticker in self.today_trades:
-                trade_time = self.today_trades[ticker]['time']
-                return {"status": "error", "message": f"Already traded {ticker} today at {trade_time.strftime('%H:%M:%S')}"}
+            open_epics = {position.get('epic') for position in open_positions}
+            if epic in open_epics:
+                return {"status": "error", "message": f"Position already exists for {ticker}"}, None
         
-        # Check maximum open positions (if enabled)
-        if self.validation_rules['check_open_position_limit']:
-            positions = self.get_all_positions()
-            if len(positions.get('positions', [])) >= self.max_open_positions:
-                return {"status": "error", "message": f"Maximum open positions limit ({self.max_open_positions}) reached"}
+        if orders_future is not None:
+            orders_response = orders_future.result()
+        elif need_orders:
+            orders_response = self.ig_client.get_working_orders()
+        else:
+            orders_response = None
         
         # Check for total positions and orders (if enabled)
-        if self.validation_rules.get('check_total_positions_and_orders', False):
-            total_check_result = self.check_total_positions_and_orders()
+        if check_total:
+            total_check_result = self.check_total_positions_and_orders(orders_response)
             if total_check_result.get('status') == 'error':
-                return total_check_result
-        
-        # Check for dividend date (if enabled)
-        if self.validation_rules['check_dividend_date']:
-            if is_dividend_date(ticker, self.ticker_data):
-                dividend_date = ticker_row['Next dividend date'].values[0]
-                return {"status": "error", "message": f"Today is a dividend date for {ticker} ({dividend_date})"}
+                return total_check_result, None
         
         # Check and cancel old deals if enabled
-        if self.validation_rules.get('check_max_deal_age', False):
-            self.check_and_cancel_old_deals()
+        if check_deal_age:
+            self.check_and_cancel_old_deals(orders_response)
         
-        return None
+        return None, epic
+    
+    def _get_format_multiplier(self, epic, current_price, price_level):
+        """
+        Get the factor that converts a TradingView price into IG's price format for an epic
+        
+        The factor follows from the digit counts of the two prices alone; it is
+        recomputed every time (two log10 calls) rather than cached, since a cached
+        factor can go stale when a price crosses a power of ten.
+        
+        Args:
+            epic (str): The IG EPIC code
+            current_price (float): Current IG price
+            price_level (float): Price level calculated from the TradingView price
+        
+        Returns:
+            float: Format multiplier (1.0 if no scaling is needed)
+        """
+        ig_format_multiplier = 1.0
+        
+        if current_price > 0 and price_level > 0:
+            # Ondalık basamak farkını bul - önemli bir format farkı varsa bu sayıları ölçeklendirmemiz gerekiyor
+            ig_digits = _digits(current_price)
+            tv_digits = _digits(price_level)
+            digit_diff = ig_digits - tv_digits
+            
+            if abs(digit_diff) >= 2:
+                # Format farkı var - ölçeklendirme faktörünü belirle
+                ig_format_multiplier = 10 ** digit_diff
+                logger.info("IG Format multiplier for %s: %s (based on IG:%s - TV:%s = %s digits)",
+                            epic, ig_format_multiplier, ig_digits, tv_digits, digit_diff)
+            else:
+                logger.info("No significant format difference detected between IG price (%s) and TV price level (%s)",
+                            current_price, price_level)
+        
+        return ig_format_multiplier
+    
+    def _get_market_details_cached(self, epic):
+        """
+        Get market details from IG, reusing a result fetched for this epic in the last few seconds
+        
+        Args:
+            epic (str): The IG EPIC code
+        
+        Returns:
+            dict: Market details or None if the request failed
+        """
+        market_details = self._market_details_cache.get(epic)
+        if market_details is not None:
+            return market_details
+        
+        # A prefetch for this epic may already be in flight, wait for it instead of asking again
+        with self._market_details_lock:
+            pending = self._market_details_pending.get(epic)
+        if pending is not None:
+            return pending.result()
+        
+        return self._fetch_market_details(epic)
+    
+    def _fetch_market_details(self, epic):
+        """Get market details from IG and cache them if the request succeeded"""
+        market_details = self.ig_client._get_market_details(epic)
+        if market_details:
+            self._market_details_cache[epic] = market_details
+        return market_details
+    
+    def _prefetch_market_details(self, epic):
+        """
+        Start fetching market details in the background
+        
+        Args:
+            epic (str): The IG EPIC code
+        """
+        with self._market_details_lock:
+            if epic in self._market_details_cache or epic in self._market_details_pending:
+                return
+            future = self._io_executor.submit(self._fetch_market_details, epic)
+            self._market_details_pending[epic] = future
+        
+        # Outside the lock: the callback runs right here if the fetch already finished
+        future.add_done_callback(lambda _: self._forget_market_details_prefetch(epic))
+    
+    def _forget_market_details_prefetch(self, epic):
+        """Drop a finished prefetch from the pending map"""
+        with self._market_details_lock:
+            self._market_details_pending.pop(epic, None)
     
     def get_epic(self, symbol):
         """
@@ -245,40 +733,43 @@ class TradeManager:
         Returns:
             str: The EPIC code or None if not found
         """
+        # Check the cache first (also remembers symbols without an EPIC)
+        epic = self.epic_cache.get(symbol)
+        if epic is not None:
+            return None if epic is _NO_EPIC else epic
+        
         # Try to get from CSV
-        ticker_row = self.ticker_data[self.ticker_data['Symbol'] == symbol]
-        if not ticker_row.empty and ticker_row['IG EPIC'].values[0] != '?':
-            epic = ticker_row['IG EPIC'].values[0]
+        epic = self.symbol_to_epic.get(symbol)
+        if epic and epic != '?':
             logger.info(f"Using EPIC {epic} for {symbol} from CSV")
+            self.epic_cache[symbol] = epic
             return epic
         
         logger.error(f"No EPIC found in CSV for {symbol}")
+        self.epic_cache[symbol] = _NO_EPIC
         return None
     
-    def _execute_trade(self, ticker, trade_params):
+    def _execute_trade(self, ticker, trade_params, epic, now=None):
         """
         Execute a trade with the given parameters
         
         Args:
             ticker (str): The ticker symbol
             trade_params (dict): The trade parameters
+            epic (str): The IG EPIC code resolved during validation
+            now (datetime, optional): Time the alert is being processed. Defaults to current time.
             
         Returns:
             dict: Result of the trade execution
         """
-        # Get the IG EPIC code for the ticker
-        epic = self.get_epic(ticker)
-        if not epic:
-            return {"status": "error", "message": f"No IG EPIC code found for {ticker}"}
-        
         try:
             # Her zaman LIMIT emirleri kullanacağız - 7/24 çalışması için
-            logger.info(f"LIMIT emri oluşturuluyor: {ticker} için {trade_params['direction']}")
+            logger.info("LIMIT emri oluşturuluyor: %s için %s", ticker, trade_params['direction'])
             
             # IG platformundan piyasa detaylarını al
-            market_details = self.ig_client._get_market_details(epic)
+            market_details = self._get_market_details_cached(epic)
             if not market_details:
-                logger.error(f"Market details alınamadı: {ticker}")
+                logger.error("Market details alınamadı: %s", ticker)
                 return {"status": "error", "message": f"Failed to get market details for {ticker}"}
                 
             # IG'den gelen fiyat bilgilerini al
@@ -292,34 +783,21 @@ class TradeManager:
             if min_stop_distance == 0:
                 # Varsayılan değer: fiyatın %1'i
                 min_stop_distance = current_price * 0.01
-                logger.warning(f"Min stop distance bilgisi alınamadı, varsayılan olarak fiyatın %1'i kullanılıyor: {min_stop_distance}")
+                logger.warning("Min stop distance bilgisi alınamadı, varsayılan olarak fiyatın %%1'i kullanılıyor: %s", min_stop_distance)
             else:
-                logger.info(f"Market min stop distance: {min_stop_distance}")
+                logger.info("Market min stop distance: %s", min_stop_distance)
             
             # TradingView'den gelen orijinal fiyat ve hesaplanan fiyat seviyesi
             original_price = trade_params['original_price']
             price_level = trade_params['price_level']
             
             # IG fiyatı ve TV fiyatı formatı arasında fark varsa ölçeklendirme faktörünü hesapla
-            ig_format_multiplier = 1.0
-            
-            if current_price > 0 and price_level > 0:
-                # Ondalık basamak farkını bul - önemli bir format farkı varsa bu sayıları ölçeklendirmemiz gerekiyor
-                ig_digits = len(str(int(current_price)))
-                tv_digits = len(str(int(price_level)))
-                digit_diff = ig_digits - tv_digits
-                
-                if abs(digit_diff) >= 2:
-                    # Format farkı var - ölçeklendirme faktörünü belirle
-                    ig_format_multiplier = 10 ** digit_diff
-                    logger.info(f"IG Format multiplier: {ig_format_multiplier} (based on IG:{ig_digits} - TV:{tv_digits} = {digit_diff} digits)")
-                else:
-                    logger.info(f"No significant format difference detected between IG price ({current_price}) and TV price level ({price_level})")
+            ig_format_multiplier = self._get_format_multiplier(epic, current_price, price_level)
             
             # ADIM 2: Giriş fiyatını IG formatına dönüştür
             ig_formatted_level = price_level * ig_format_multiplier
             limit_level = round(ig_formatted_level, 4)
-            logger.info(f"IG formatted level: {ig_formatted_level} (TV price {price_level} * {ig_format_multiplier})")
+            logger.info("IG formatted level: %s (TV price %s * %s)", ig_formatted_level, price_level, ig_format_multiplier)
             
             # ADIM 3: Stop loss ve limit mesafelerini hesapla
             # Öncelikle trade_calculator'dan gelen orijinal hesaplamaları alalım
@@ -327,47 +805,28 @@ class TradeManager:
             original_limit_distance = trade_params['limit_distance']
             
             # Log orijinal değerleri
-            logger.info(f"Original calculator values - Stop: {original_stop_distance}, Limit: {original_limit_distance}")
+            logger.info("Original calculator values - Stop: %s, Limit: %s", original_stop_distance, original_limit_distance)
             
             # ÖNEMLİ - YÜKSEK FİYATLI HİSSELER İÇİN IG API'YE GÖNDERME FORMATI
             # Her şeyin aynı ölçekte olduğundan emin olalım
             # Yüksek fiyatlar için IG'nin API'sinde format farkı var, bu farkı düzeltiyoruz
             
-            # Önce format düzeltmesi uyguluyoruz
-            if current_price >= 100 and limit_level >= 100:
-                # Yüksek fiyatlı hisse - stop/limit değerlerini normalize et
-                final_stop_distance = original_stop_distance  # Zaten doğru formatta
-                final_limit_distance = original_limit_distance  # Zaten doğru formatta
-                
-                # Mesafe değerlerinin fiyat ile uyumlu olduğundan emin ol
-                price_ratio = current_price / limit_level
-                if abs(price_ratio - 1.0) > 0.1:  # Fiyat oranı %10'dan fazla farklıysa
-                    logger.warning(f"Price ratio {price_ratio} indicates format mismatch, adjusting distances")
-                    final_stop_distance = original_stop_distance * price_ratio
-                    final_limit_distance = original_limit_distance * price_ratio
-                
-                logger.info(f"High price stock - using direct distance values: Stop={final_stop_distance}, Limit={final_limit_distance}")
-            else:
-                # Normal fiyat aralığı - ölçeklendirme gerekiyorsa uygula
-                if ig_format_multiplier != 1.0:
-                    final_stop_distance = original_stop_distance * ig_format_multiplier
-                    final_limit_distance = original_limit_distance * ig_format_multiplier
-                    logger.info(f"Scaled distances - Stop: {final_stop_distance}, Limit: {final_limit_distance}")
-                else:
-                    final_stop_distance = original_stop_distance
-                    final_limit_distance = original_limit_distance
-                    logger.info(f"No scaling needed for distances, using original values")
+            # Önce format düzeltmesi uyguluyoruz - fiyat bandına göre (_PRICE_BANDS)
+            scale_distances = _distance_scaler(current_price, limit_level)
+            final_stop_distance, final_limit_distance = scale_distances(
+                original_stop_distance, original_limit_distance, current_price, limit_level, ig_format_multiplier
+            )
             
             # Minimum mesafeyi kontrol et - IG API'nin kabul edeceği minimum mesafe
             min_distance = max(min_stop_distance, current_price * 0.001)  # Fiyatın en az %0.1'i veya API min değeri
             
             # Mesafelerin çok küçük olmamasını sağla - sadece gerçekten çok küçükse minimum değeri kullan
             if final_stop_distance < min_distance:
-                logger.warning(f"Stop distance ({final_stop_distance}) too small. Using: {min_distance}")
+                logger.warning("Stop distance (%s) too small. Using: %s", final_stop_distance, min_distance)
                 final_stop_distance = min_distance
                 
             if final_limit_distance < min_distance:
-                logger.warning(f"Limit distance ({final_limit_distance}) too small. Using: {min_distance}")
+                logger.warning("Limit distance (%s) too small. Using: %s", final_limit_distance, min_distance)
                 final_limit_distance = min_distance
                                 
             # BUY/SELL işlemlerinde beklenen seviyeleri hesapla
@@ -381,8 +840,8 @@ class TradeManager:
                 expected_stop_level = limit_level + final_stop_distance
                 expected_limit_level = limit_level - final_limit_distance
                 
-            logger.info(f"Beklenen seviyeler: Stop={expected_stop_level}, Limit={expected_limit_level}")
-            logger.info(f"Hesaplanan mesafeler: Stop={final_stop_distance} (original: {original_stop_distance}), Limit={final_limit_distance} (original: {original_limit_distance})")
+            logger.info("Beklenen seviyeler: Stop=%s, Limit=%s", expected_stop_level, expected_limit_level)
+            logger.info("Hesaplanan mesafeler: Stop=%s (original: %s), Limit=%s (original: %s)", final_stop_distance, original_stop_distance, final_limit_distance, original_limit_distance)
             
             # IG API her zaman pozitif mesafe değeri bekler
             # Değerler pozitif olmalı, yönlendirmeyi API kendisi yapar
@@ -391,42 +850,38 @@ class TradeManager:
             
             # Format sorununu çözmek için son bir kontrol
             # eğer limitDistance ya da stopDistance çok büyükse bunları düzelt
-            if final_stop_distance > 1000:
-                logger.warning(f"Stop distance {final_stop_distance} is too large, reducing by factor of 100")
-                final_stop_distance = final_stop_distance / 100
-            
-            if final_limit_distance > 1000:
-                logger.warning(f"Limit distance {final_limit_distance} is too large, reducing by factor of 100")
-                final_limit_distance = final_limit_distance / 100
-            
-            # ADIM 5: Tüm bilgileri logla
-            price_info = {
-                "original_price": original_price,
-                "calculated_price_level": price_level,
-                "ig_format_multiplier": ig_format_multiplier,
-                "ig_formatted_level": ig_formatted_level,
-                "final_limit_level": limit_level,
-                "ig_current_price": current_price,
-                "ig_bid_price": bid_price,
-                "ig_offer_price": offer_price,
-                "original_stop_distance": original_stop_distance,
-                "original_limit_distance": original_limit_distance,
-                "calculated_stop_distance": final_stop_distance,
-                "calculated_limit_distance": final_limit_distance,
-                "min_stop_distance": min_stop_distance,
-                "stop_level": expected_stop_level,
-                "limit_level": expected_limit_level
-            }
+            final_stop_distance = _cap_distance("Stop", final_stop_distance, limit_level)
+            final_limit_distance = _cap_distance("Limit", final_limit_distance, limit_level)
             
-            logger.info(f"Fiyat dönüştürme bilgileri: {json.dumps(price_info)}")
+            # ADIM 5: Tüm bilgileri logla - sadece INFO açıksa oluştur
+            if logger.isEnabledFor(logging.INFO):
+                price_info = {
+                    "original_price": original_price,
+                    "calculated_price_level": price_level,
+                    "ig_format_multiplier": ig_format_multiplier,
+                    "ig_formatted_level": ig_formatted_level,
+                    "final_limit_level": limit_level,
+                    "ig_current_price": current_price,
+                    "ig_bid_price": bid_price,
+                    "ig_offer_price": offer_price,
+                    "original_stop_distance": original_stop_distance,
+                    "original_limit_distance": original_limit_distance,
+                    "calculated_stop_distance": final_stop_distance,
+                    "calculated_limit_distance": final_limit_distance,
+                    "min_stop_distance": min_stop_distance,
+                    "stop_level": expected_stop_level,
+                    "limit_level": expected_limit_level
+                }
+                
+                logger.info("Fiyat dönüştürme bilgileri: %s", json.dumps(price_info))
             
-            logger.info(f"İşlem detayları:")
-            logger.info(f"Piyasa durumu: {market_status}, IG Fiyatı: {current_price}")
-            logger.info(f"TradingView fiyatı: {original_price}, Hesaplanan Fiyat Seviyesi: {price_level}")
-            logger.info(f"IG Formatında Limit Seviyesi: {limit_level}")
-            logger.info(f"Yön: {trade_params['direction']}, Boyut: {trade_params['position_size']}")
-            logger.info(f"Stop Distance: {final_stop_distance:.2f}")
-            logger.info(f"Limit Distance: {final_limit_distance:.2f}")
+            logger.info("İşlem detayları:")
+            logger.info("Piyasa durumu: %s, IG Fiyatı: %s", market_status, current_price)
+            logger.info("TradingView fiyatı: %s, Hesaplanan Fiyat Seviyesi: %s", original_price, price_level)
+            logger.info("IG Formatında Limit Seviyesi: %s", limit_level)
+            logger.info("Yön: %s, Boyut: %s", trade_params['direction'], trade_params['position_size'])
+            logger.info("Stop Distance: %.2f", final_stop_distance)
+            logger.info("Limit Distance: %.2f", final_limit_distance)
             
             # ADIM 6: Pozisyon oluştur
             # IG API mesafeleri (distance) kullanıyor seviyeler (level) değil
@@ -440,7 +895,7 @@ class TradeManager:
             # 176.851 * 56.5 = 9992 GBP (yaklaşık 10000 GBP'lik pozisyon)
             # Bu durumda işlem boyutu doğru ve ayarlanmamalı
             trade_value_gbp = limit_level * position_size
-            logger.info(f"Trade value check: {limit_level} * {position_size} = £{trade_value_gbp:.2f}")
+            logger.info("Trade value check: %s * %s = £%.2f", limit_level, position_size, trade_value_gbp)
             
             # İşlem değeri makul sınırlar içinde olmalı (genelde 5000-15000 GBP arası)
             MAX_EXPECTED_TRADE_VALUE = 15000  # £15,000 maksimum
@@ -450,24 +905,12 @@ class TradeManager:
                 # Bu bir yüksek fiyatlı hisse ve pozisyon değeri çok büyük
                 # Pozisyon boyutunu düşür
                 adjusted_size = round(MAX_EXPECTED_TRADE_VALUE / limit_level, 1)
-                logger.warning(f"Position value {trade_value_gbp} is too large. Adjusting size from {position_size} to {adjusted_size}")
+                logger.warning("Position value %s is too large. Adjusting size from %s to %s", trade_value_gbp, position_size, adjusted_size)
                 position_size = adjusted_size
             
-            # Mesafelerin doğru ölçekte olduğunu kontrol et
-            # Eğer limit fiyatının %10'undan büyükse, muhtemelen ölçekleme sorunu var
-            max_reasonable_distance = limit_level * 0.1  # Fiyatın %10'u
-            
-            if final_stop_distance > max_reasonable_distance:
-                logger.warning(f"Stop distance {final_stop_distance} is suspiciously large (>{max_reasonable_distance}). Adjusting.")
-                final_stop_distance = round(final_stop_distance / 100, 2)  # 2 ondalık basamak kullan (eskiden 1 idi)
-                
-            if final_limit_distance > max_reasonable_distance:
-                logger.warning(f"Limit distance {final_limit_distance} is suspiciously large (>{max_reasonable_distance}). Adjusting.")
-                final_limit_distance = round(final_limit_distance / 100, 2)  # 2 ondalık basamak kullan (eskiden 1 idi)
-            
             # Log mesafe değerlerini kontrol et ve sonuçları yazdır
-            logger.info(f"Stop Distance: {final_stop_distance:.2f}")
-            logger.info(f"Limit Distance: {final_limit_distance:.2f}")
+            logger.info("Stop Distance: %.2f", final_stop_distance)
+            logger.info("Limit Distance: %.2f", final_limit_distance)
             
             # Sayısal formatlama konusundaki tutarsızlıkları düzeltmek için
             # son değerleri kesin formatlar ile tanımlayalım
@@ -476,7 +919,7 @@ class TradeManager:
             position_size = round(position_size, 2)
             
             # Son durumu logla - sabit formatla göstermek için .2f kullanıyoruz
-            logger.info(f"FINAL VALUES - Size: {position_size:.2f}, Stop: {final_stop_distance:.2f}, Limit: {final_limit_distance:.2f}")
+            logger.info("FINAL VALUES - Size: %.2f, Stop: %.2f, Limit: %.2f", position_size, final_stop_distance, final_limit_distance)
             
             # API çağrısını yap
             result = self.ig_client.create_position(
@@ -490,17 +933,26 @@ class TradeManager:
                 expiry="DFB"  # Daily Funded Bet - hisse senetleri için bu varsayılan değerdir
             )
             
-            # API yanıtını detaylı şekilde logla
-            logger.info(f"IG API yanıtı: {json.dumps(result)}")
+            # API yanıtını logla - tam yanıt sadece DEBUG açıkken serileştirilir
+            logger.info("IG API yanıt durumu: %s", result.get('status'))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("IG API yanıtı: %s", json.dumps(result))
             
             if result.get('status') == 'success':
+                # Yeni pozisyon sonraki kontrollerde ve geçmişte görünsün
+                self._positions_cache.clear()
+                self._history_cache.clear()
+                
                 # İşlem başarılı - günlük işlem takibine ekle
-                self.today_trades[ticker] = {
-                    "time": datetime.now(),
-                    "params": trade_params,
-                    "epic": epic,
-                    "deal_reference": result.get('deal_reference')
-                }
+                trade_time = now or datetime.now()
+                self.today_trades[ticker] = TradeRecord(
+                    time=trade_time,
+                    date=trade_time.date(),
+                    direction=trade_params['direction'],
+                    epic=epic,
+                    deal_reference=result.get('deal_reference'),
+                    params=trade_params
+                )
                 
                 # Başarılı sonucu döndür
                 return {
@@ -549,7 +1001,7 @@ class TradeManager:
                 }
             
         except Exception as e:
-            logger.error(f"Error executing trade: {e}")
+            logger.error("Error executing trade: %s", e)
             return {"status": "error", "message": f"Error executing trade: {str(e)}", "ticker": ticker}
     
     def check_position_status(self, deal_reference=None, ticker=None):
@@ -569,14 +1021,18 @@ class TradeManager:
         # If ticker is provided but no deal reference, try to find the deal reference from today's trades
         if ticker and not deal_reference:
             if ticker in self.today_trades:
-                deal_reference = self.today_trades[ticker].get('deal_reference')
+                deal_reference = self.today_trades[ticker].deal_reference
                 if not deal_reference:
                     return {"status": "error", "message": f"No deal reference found for ticker {ticker}"}
             else:
                 return {"status": "error", "message": f"No trade found today for ticker {ticker}"}
         
-        # Check the status using the IG API
-        status = self.ig_client.check_deal_status(deal_reference)
+        # Check the status using the IG API (failed lookups are not cached)
+        status = self._deal_status_cache.get(deal_reference)
+        if status is None:
+            status = self.ig_client.check_deal_status(deal_reference)
+            if status is not None:
+                self._deal_status_cache[deal_reference] = status
         
         if status is None:
             return {"status": "error", "message": f"Failed to retrieve status for deal reference {deal_reference}"}
@@ -601,50 +1057,13 @@ class TradeManager:
         Returns:
             dict: All open positions or error message
         """
-        positions = self.ig_client.get_open_positions()
+        positions = self._get_positions_cached()
         
         if positions is None:
             return {"status": "error", "message": "Failed to get open positions from IG Markets"}
         
         # Format the positions in a more readable way
-        formatted_positions = []
-        for position in positions:
-            market = position.get('market', {})
-            pos = position.get('position', {})
-            
-            # Get additional market details for stopLevel and limitLevel
-            try:
-                # Get deal ID and fetch its details to get stop and limit levels
-                deal_id = pos.get('dealId')
-                position_details = self.ig_client.get_position_by_deal_id(deal_id) if deal_id else None
-                
-                if position_details:
-                    # Extract stopLevel and limitLevel from position details
-                    stop_level = position_details.get('position', {}).get('stopLevel')
-                    limit_level = position_details.get('position', {}).get('limitLevel')
-                else:
-                    stop_level = None
-                    limit_level = None
-            except Exception as e:
-                logger.error(f"Error getting position details: {e}")
-                stop_level = None
-                limit_level = None
-            
-            formatted_positions.append({
-                "epic": market.get('epic'),
-                "instrumentName": market.get('instrumentName'),
-                "dealId": pos.get('dealId'),
-                "direction": pos.get('direction'),
-                "size": pos.get('size'),
-                "level": pos.get('level'),
-                "stopLevel": stop_level,
-                "limitLevel": limit_level,
-                "bid": market.get('bid'),
-                "offer": market.get('offer'),
-                "profit": market.get('profit', {}).get('value'),
-                "currency": market.get('profit', {}).get('currency', 'GBP'),
-                "createdDate": pos.get('createdDate')
-            })
+        formatted_positions = [_format_position(position) for position in positions]
         
         return {
             "status": "success",
@@ -652,6 +1071,22 @@ class TradeManager:
             "positions": formatted_positions
         }
     
+    def _get_positions_cached(self):
+        """
+        Get open positions from IG, reusing a result fetched in the last few seconds
+        
+        Returns:
+            list: Open positions or None if the request failed
+        """
+        positions = self._positions_cache.get('positions')
+        if positions is not None:
+            return positions
+        
+        positions = self.ig_client.get_open_positions()
+        if positions is not None:
+            self._positions_cache['positions'] = positions
+        return positions
+    
     def get_transaction_history(self, days=7, max_results=50):
         """
         Get transaction history for the past X days
@@ -663,13 +1098,13 @@ class TradeManager:
         Returns:
             dict: Transaction history or error message
         """
-        # Calculate date range
-        to_date = datetime.now()
-        from_date = to_date - timedelta(days=days)
+        cache_key = ('transactions', days, max_results)
+        cached = self._history_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
-        # Format dates for API
-        from_date_str = from_date.strftime("%Y-%m-%d")
-        to_date_str = to_date.strftime("%Y-%m-%d")
+        # Date range for the API (YYYY-MM-DD)
+        from_date_str, to_date_str = _history_date_range(date.today(), days)
         
         # Get transaction history from IG
         transactions = self.ig_client.get_transaction_history(
@@ -682,27 +1117,15 @@ class TradeManager:
             return {"status": "error", "message": "Failed to get transaction history from IG Markets"}
         
         # Format the transactions
-        formatted_transactions = []
-        for transaction in transactions:
-            formatted_transactions.append({
-                "date": transaction.get('dateUtc'),
-                "transaction_type": transaction.get('transactionType'),
-                "instrument_name": transaction.get('instrumentName'),
-                "epic": transaction.get('epic'),
-                "reference": transaction.get('reference'),
-                "opening_level": transaction.get('openLevel'),
-                "closing_level": transaction.get('closeLevel'),
-                "profit": transaction.get('profitAndLoss'),
-                "currency": transaction.get('currency'),
-                "size": transaction.get('size'),
-                "direction": transaction.get('direction')
-            })
+        formatted_transactions = [_format_transaction(transaction) for transaction in transactions]
         
-        return {
+        result = {
             "status": "success",
             "transaction_count": len(formatted_transactions),
             "transactions": formatted_transactions
         }
+        self._history_cache[cache_key] = result
+        return result
     
     def get_activity_history(self, days=7, max_results=50):
         """
@@ -715,13 +1138,13 @@ class TradeManager:
         Returns:
             dict: Activity history or error message
         """
-        # Calculate date range
-        to_date = datetime.now()
-        from_date = to_date - timedelta(days=days)
+        cache_key = ('activities', days, max_results)
+        cached = self._history_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
-        # Format dates for API
-        from_date_str = from_date.strftime("%Y-%m-%d")
-        to_date_str = to_date.strftime("%Y-%m-%d")
+        # Date range for the API (YYYY-MM-DD)
+        from_date_str, to_date_str = _history_date_range(date.today(), days)
         
         # Get activity history from IG
         activities = self.ig_client.get_activity_history(
@@ -734,29 +1157,70 @@ class TradeManager:
             return {"status": "error", "message": "Failed to get activity history from IG Markets"}
         
         # Format the activities
-        formatted_activities = []
-        for activity in activities:
-            formatted_activities.append({
-                "date": activity.get('date'),
-                "activity_type": activity.get('type'),
-                "status": activity.get('status'),
-                "description": activity.get('description'),
-                "deal_id": activity.get('details', {}).get('dealId'),
-                "deal_reference": activity.get('details', {}).get('dealReference'),
-                "epic": activity.get('details', {}).get('epic'),
-                "market_name": activity.get('details', {}).get('marketName'),
-                "size": activity.get('details', {}).get('size'),
-                "direction": activity.get('details', {}).get('direction'),
-                "level": activity.get('details', {}).get('level'),
-                "stop_level": activity.get('details', {}).get('stopLevel'),
-                "limit_level": activity.get('details', {}).get('limitLevel')
-            })
+        formatted_activities = [_format_activity(activity) for activity in activities]
         
-        return {
+        result = {
             "status": "success",
             "activity_count": len(formatted_activities),
             "activities": formatted_activities
         }
+        self._history_cache[cache_key] = result
+        return result
+    
+    def get_history_bulk(self, date_ranges, max_results=100):
+        """
+        Get transactions and activities for several date ranges with one request per history type
+        
+        The union of the ranges is fetched once and split client-side, so reports
+        don't need one IG round-trip per day. IG returns at most 100 rows per
+        request, counted over the whole union.
+        
+        Args:
+            date_ranges (list): (from_date, to_date) date pairs, both ends inclusive
+            max_results (int): Maximum number of records to fetch per type
+        
+        Returns:
+            dict: {"status", "ranges": [{"from", "to", "transactions", "activities"}]} in the given order
+        """
+        if not date_ranges:
+            return {"status": "success", "ranges": []}
+        
+        from_date_str = min(from_date for from_date, _ in date_ranges).isoformat()
+        to_date_str = max(to_date for _, to_date in date_ranges).isoformat()
+        
+        # Activities load in the background while transactions are fetched here
+        activities_future = self._io_executor.submit(
+            self.ig_client.get_activity_history,
+            from_date=from_date_str,
+            to_date=to_date_str,
+            max_results=max_results
+        )
+        transactions = self.ig_client.get_transaction_history(
+            from_date=from_date_str,
+            to_date=to_date_str,
+            max_results=max_results
+        )
+        activities = activities_future.result()
+        
+        if transactions is None or activities is None:
+            return {"status": "error", "message": "Failed to get history from IG Markets"}
+        
+        transaction_parts = _split_by_day([_format_transaction(t) for t in transactions], date_ranges)
+        activity_parts = _split_by_day([_format_activity(a) for a in activities], date_ranges)
+        
+        return {
+            "status": "success",
+            "ranges": [
+                {
+                    "from": from_date.isoformat(),
+                    "to": to_date.isoformat(),
+                    "transactions": range_transactions,
+                    "activities": range_activities
+                }
+                for (from_date, to_date), range_transactions, range_activities
+                in zip(date_ranges, transaction_parts, activity_parts)
+            ]
+        }
     
     def get_all_history(self, days=7, max_results=50):
         """
@@ -773,55 +1237,39 @@ class TradeManager:
             # Log the start of the function
             logger.info(f"Getting comprehensive history for the past {days} days, max {max_results} results per type")
             
-            # Get positions with detailed error handling
-            try:
-                logger.info("Getting open positions...")
-                positions = self.get_all_positions()
-                logger.info(f"Positions retrieved: {positions is not None}")
-                if positions is None:
-                    positions = {"status": "error", "positions": [], "position_count": 0}
-            except Exception as e:
-                logger.error(f"Error getting positions: {e}")
-                positions = {"status": "error", "positions": [], "position_count": 0}
+            # Make sure we are logged in once, before the parallel calls race to log in
+            self.ig_client._ensure_session()
             
-            # Get transactions with detailed error handling
-            try:
-                logger.info("Getting transaction history...")
-                transactions = self.get_transaction_history(days, max_results)
-                logger.info(f"Transactions retrieved: {transactions is not None}")
-                if transactions is None:
-                    transactions = {"status": "error", "transactions": [], "transaction_count": 0}
-            except Exception as e:
-                logger.error(f"Error getting transactions: {e}")
-                transactions = {"status": "error", "transactions": [], "transaction_count": 0}
-            
-            # Get activities with detailed error handling
-            try:
-                logger.info("Getting activity history...")
-                activities = self.get_activity_history(days, max_results)
-                logger.info(f"Activities retrieved: {activities is not None}")
-                if activities is None:
-                    activities = {"status": "error", "activities": [], "activity_count": 0}
-            except Exception as e:
-                logger.error(f"Error getting activities: {e}")
-                activities = {"status": "error", "activities": [], "activity_count": 0}
+            # The three IG calls are independent network round-trips: transactions and
+            # activities load on the shared I/O pool while positions are fetched here
+            transactions_future = self._io_executor.submit(
+                self._fetch_history_part, "transactions", self.get_transaction_history, (days, max_results),
+                {"status": "error", "transactions": [], "transaction_count": 0}
+            )
+            activities_future = self._io_executor.submit(
+                self._fetch_history_part, "activities", self.get_activity_history, (days, max_results),
+                {"status": "error", "activities": [], "activity_count": 0}
+            )
+            positions = self._fetch_history_part(
+                "positions", self.get_all_positions, (),
+                {"status": "error", "positions": [], "position_count": 0}
+            )
+            transactions = transactions_future.result()
+            activities = activities_future.result()
             
             # Ensure we have valid data structures
-            pos_status = positions.get("status") if isinstance(positions, dict) else "error"
-            tx_status = transactions.get("status") if isinstance(transactions, dict) else "error"
-            act_status = activities.get("status") if isinstance(activities, dict) else "error"
-            
-            # Get data safely with fallbacks
-            pos_list = positions.get("positions", []) if isinstance(positions, dict) else []
-            pos_count = positions.get("position_count", 0) if isinstance(positions, dict) else 0
-            tx_list = transactions.get("transactions", []) if isinstance(transactions, dict) else []
-            tx_count = transactions.get("transaction_count", 0) if isinstance(transactions, dict) else 0
-            act_list = activities.get("activities", []) if isinstance(activities, dict) else []
-            act_count = activities.get("activity_count", 0) if isinstance(activities, dict) else 0
+            pos_status, pos_list, pos_count = _unpack_history_part(positions, "positions", "position_count")
+            tx_status, tx_list, tx_count = _unpack_history_part(transactions, "transactions", "transaction_count")
+            act_status, act_list, act_count = _unpack_history_part(activities, "activities", "activity_count")
+            
+            # Nothing succeeded
+            if "success" not in (pos_status, tx_status, act_status):
+                logger.warning("Could not retrieve any history data")
+                return _empty_history(days)
             
             # Combine into a comprehensive response
             result = {
-                "status": "success" if (pos_status == "success" or tx_status == "success" or act_status == "success") else "error",
+                "status": "success",
                 "open_positions": pos_list,
                 "position_count": pos_count,
                 "transactions": tx_list,
@@ -836,21 +1284,55 @@ class TradeManager:
             
         except Exception as e:
             logger.error(f"Error in get_all_history: {e}", exc_info=True)
-            return {
-                "status": "error",
-                "message": f"Failed to get history data: {str(e)}",
-                "open_positions": [],
-                "position_count": 0,
-                "transactions": [],
-                "transaction_count": 0,
-                "activities": [],
-                "activity_count": 0,
-                "days_history": days
-            }
+            return _empty_history(days, message=f"Failed to get history data: {str(e)}")
+    
+    def _fetch_history_part(self, name, fetch, args, fallback):
+        """
+        Run one of the get_all_history sub-calls, returning the fallback dict on failure
+        
+        Args:
+            name (str): Name of the data being fetched, used for logging
+            fetch (callable): Method that fetches the data
+            args (tuple): Positional arguments for fetch
+            fallback (dict): Result to use if the call fails or returns None
+        
+        Returns:
+            dict: Result of the call or the fallback
+        """
+        try:
+            logger.info(f"Getting {name}...")
+            result = fetch(*args)
+            logger.info(f"{name.capitalize()} retrieved: {result is not None}")
+            return result if result is not None else fallback
+        except (requests.RequestException, KeyError, ValueError) as e:
+            # Expected failures (network, unexpected response shape) - the message is enough
+            logger.error(f"Error getting {name}: {e}")
+            return fallback
+        except Exception as e:
+            logger.error(f"Unexpected error getting {name}: {e}", exc_info=True)
+            return fallback
+    
+    def _prune_today_trades(self, today):
+        """
+        Drop today_trades entries from previous days, on the first alert of a new day
+        
+        Args:
+            today (date): The current date
+        """
+        if today == self._today_trades_date:
+            return
+        
+        self.today_trades = {
+            ticker: trade for ticker, trade in self.today_trades.items()
+            if trade.date == today
+        }
+        self._today_trades_date = today
     
     def reset_daily_trades(self):
         """Reset the daily trades tracking at the start of a new day"""
         self.today_trades = {}
+        self._today_trades_date = date.today()
+        self.epic_cache.clear()
     
     def create_working_order(self, trade_params):
         """
@@ -869,11 +1351,10 @@ class TradeManager:
         Returns:
             dict: The result of the order including status and deal reference
         """
-        required_params = ['epic', 'direction', 'size', 'order_level']
-        for param in required_params:
-            if param not in trade_params:
-                logger.error(f"Missing required parameter: {param}")
-                return {"status": "error", "reason": f"Missing required parameter: {param}"}
+        if not trade_params.keys() >= _WORKING_ORDER_REQUIRED_SET:
+            param = next(p for p in _WORKING_ORDER_REQUIRED if p not in trade_params)
+            logger.error(f"Missing required parameter: {param}")
+            return {"status": "error", "reason": f"Missing required parameter: {param}"}
         
         # Extract parameters with defaults
         epic = trade_params['epic']
@@ -897,8 +1378,10 @@ class TradeManager:
             guaranteed_stop=guaranteed_stop
         )
         
-        # API yanıtını detaylı loglayalım
-        logger.info(f"Working order API yanıtı: {json.dumps(result)}")
+        # API yanıtını logla - tam yanıt sadece DEBUG açıkken serileştirilir
+        logger.info("Working order API yanıt durumu: %s", result.get('status'))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Working order API yanıtı: %s", json.dumps(result))
         
         # API yanıtında deal bilgileri var mı kontrol edelim
         deal_reference = result.get('deal_reference')
@@ -916,7 +1399,7 @@ class TradeManager:
             if hasattr(self, 'trade_logger'):
                 # Save the trade details to CSV
                 trade_details = {
-                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "timestamp": datetime.now().isoformat(' ', 'seconds'),
                     "type": "WORKING_ORDER",
                     "epic": epic,
                     "direction": direction,
@@ -945,10 +1428,13 @@ class TradeManager:
         
         return result
     
-    def check_and_cancel_old_deals(self):
+    def check_and_cancel_old_deals(self, orders_response=None):
         """
         Check for and cancel deals (working orders) that are older than max_deal_age_minutes
         
+        Args:
+            orders_response (dict, optional): Working orders already fetched from IG
+        
         Returns:
             dict: Result with canceled orders info
         """
@@ -957,7 +1443,8 @@ class TradeManager:
             max_age_minutes = getattr(self, 'max_deal_age_minutes', 60)
             
             # Get working orders from IG API
-            orders_response = self.ig_client.get_working_orders()
+            if orders_response is None:
+                orders_response = self.ig_client.get_working_orders()
             
             if not orders_response or not isinstance(orders_response, dict):
                 logger.error("Failed to get working orders")
@@ -1036,10 +1523,13 @@ class TradeManager:
             logger.error(f"Error in check_and_cancel_old_deals: {e}")
             return {"status": "error", "message": f"Error checking old deals: {str(e)}"}
     
-    def check_total_positions_and_orders(self):
+    def check_total_positions_and_orders(self, orders_response=None):
         """
         Check if the total of open positions and working orders exceeds the limit
         
+        Args:
+            orders_response (dict, optional): Working orders already fetched from IG
+        
         Returns:
             dict: Error result if limit exceeded, None otherwise
         """
@@ -1052,7 +1542,8 @@ class TradeManager:
             position_count = len(positions.get('positions', []))
             
             # Get working orders
-            orders_response = self.ig_client.get_working_orders()
+            if orders_response is None:
+                orders_response = self.ig_client.get_working_orders()
             
             if isinstance(orders_response, dict) and 'workingOrders' in orders_response:
                 order_count = len(orders_response.get('workingOrders', []))
@@ -1,25 +1,270 @@
 """
 Webhook handler for processing incoming alerts from TradingView
 """
+import os
 import logging
 import json
 import time
+import threading
+from operator import itemgetter
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
 from trading_bot.trade_manager import TradeManager
+from trading_bot.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Fields process_alert can't do without (tuple order decides which one is reported)
+_ALERT_REQUIRED = ('epic', 'direction', 'size')
+_ALERT_REQUIRED_SET = frozenset(_ALERT_REQUIRED)
+
+# Order kind -> (TradeManager method, log message) used by process_alert
+_ALERT_DISPATCH = {
+    'working': ('create_working_order', "Creating working order with parameters: %s"),
+    'market': ('place_trade', "Executing trade with parameters: %s"),
+}
+
+# Fields process_webhook can't do without
+_WEBHOOK_REQUIRED = itemgetter('symbol', 'direction')
+
+# Fixed error result, returned as is (callers only serialize results, never modify them)
+_ERR_MISSING_FIELDS = {
+    'status': 'error',
+    'message': 'Missing required fields: symbol and direction are required'
+}
+
+_VALID_DIRECTIONS = frozenset(('BUY', 'SELL'))
+
+# Webhook flag values read as true (guaranteed_stop may arrive as a string or a JSON bool)
+_TRUE_STRINGS = frozenset(('true', '1', 'yes', 'y', 'on'))
+
+# Order calls rejected for rate limits are retried with exponential backoff
+_ORDER_ATTEMPTS = 3
+_ORDER_BACKOFF_MIN = 0.5
+_ORDER_BACKOFF_MAX = 8.0
+# IGClient reports non-200 order responses as "API Error: <status>"; IG signals used-up
+# request allowances with these error codes (usually on a 403)
+_RATE_LIMIT_REASON = 'API Error: 429'
+_ALLOWANCE_ERROR_CODES = frozenset((
+    'error.public-api.exceeded-api-key-allowance',
+    'error.public-api.exceeded-account-allowance',
+    'error.public-api.exceeded-account-trading-allowance',
+))
+
+# Background webhook processing (trading setting 'async_webhooks'): worker threads and
+# how many accepted webhooks may be waiting or running before callers process inline
+_WEBHOOK_WORKERS = 8
+_WEBHOOK_BACKLOG = 64
+
+# Threads shared by process_webhook_batch calls; caps the 'max_inflight_webhooks' setting
+_BATCH_WORKERS = 8
+
+_ACCEPTED = {'status': 'accepted', 'message': 'Webhook queued for processing'}
+
+def _is_rate_limited(result):
+    """True if an IG order result is an error caused by a rate limit or allowance, which is safe to resend"""
+    if not isinstance(result, dict) or result.get('status') != 'error':
+        return False
+    if result.get('reason') == _RATE_LIMIT_REASON:
+        return True
+    
+    error_code = result.get('error_code')
+    if not error_code and isinstance(result.get('details'), str):
+        # details holds the raw IG response body, e.g. {"errorCode": "..."}
+        try:
+            error_code = json.loads(result['details']).get('errorCode')
+        except (ValueError, AttributeError):
+            return False
+    return error_code in _ALLOWANCE_ERROR_CODES
+
+def _decode_webhook(data):
+    """Webhook data as a dict; raw JSON (bytes or str, e.g. a request body) is parsed once"""
+    if isinstance(data, (bytes, bytearray, str)):
+        return json.loads(data)
+    return data
+
+@dataclass(slots=True)
+class _TickerLookups:
+    """Lookups built once from the ticker CSV; the first CSV row wins for duplicates"""
+    symbol_to_epic: dict = field(default_factory=dict)
+    base_to_epic: dict = field(default_factory=dict)  # symbol without 'MARKET:' prefix -> EPIC
+    epic_to_size: dict = field(default_factory=dict)  # EPIC -> float size (None if unparsable)
+
+@dataclass(slots=True)
+class _AlertSchema:
+    """Alert fields coerced to their types once, see from_dict"""
+    epic: str
+    direction: str
+    size: float
+    order_level: float | None = None
+    limit_distance: float = 0.0
+    stop_distance: float = 0.0
+    guaranteed_stop: bool = False
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Parse alert data (required fields already checked)
+        
+        Raises:
+            ValueError, TypeError: If a numeric field can't be converted
+        """
+        order_level = data.get('order_level')
+        return cls(
+            epic=data['epic'],
+            direction=data['direction'],
+            size=float(data['size']),
+            order_level=None if order_level is None else float(order_level),
+            limit_distance=float(data.get('limit_distance', 0)),
+            stop_distance=float(data.get('stop_distance', 0)),
+            guaranteed_stop=str(data.get('guaranteed_stop', '')).lower() in _TRUE_STRINGS,
+        )
+    
+    def trade_params(self, kind):
+        """
+        Build the parameters for the TradeManager call
+        
+        Args:
+            kind (str): 'working' (limit order, needs order_level) or 'market'
+        
+        Returns:
+            dict: Trade parameters
+        """
+        trade_params = {'epic': self.epic, 'direction': self.direction, 'size': self.size}
+        if kind == 'working':
+            if self.order_level is None:
+                raise KeyError('order_level')
+            trade_params['order_level'] = self.order_level
+        trade_params['limit_distance'] = self.limit_distance
+        trade_params['stop_distance'] = self.stop_distance
+        trade_params['guaranteed_stop'] = self.guaranteed_stop
+        return trade_params
+
 class WebhookHandler:
     """
     Handler for incoming webhook requests from TradingView
     """
     
+    # Known attributes live in slots, so reading them is a slot load rather than a
+    # dict lookup. '__dict__' stays (allocated lazily) so methods can still be
+    # patched on the instance, e.g. mock.patch('app.webhook_handler.process_webhook')
+    __slots__ = (
+        'ig_api', 'settings_manager', '_trade_manager', '_trade_manager_lock',
+        'last_reset_day', '_ticker_lookups', '_ticker_lookups_version',
+        '_trading_settings', '_settings_version', '_market_details_cache',
+        '_webhook_executor', '_webhook_slots', '_batch_executor', '__dict__',
+    )
+    
     def __init__(self, ig_api=None, settings_manager=None):
         """Initialize the webhook handler"""
         self.ig_api = ig_api
         self.settings_manager = settings_manager
-        self.trade_manager = TradeManager()
+        self._trade_manager = None  # Built on first use, see the trade_manager property
+        self._trade_manager_lock = threading.Lock()
         self.last_reset_day = datetime.now().day
+        
+        # Symbol/EPIC lookups built from the ticker CSV on first use, rebuilt when
+        # the CSV's mtime changes or reload_ticker_data is called
+        self._ticker_lookups = None
+        self._ticker_lookups_version = None
+        
+        # 'trading' section of settings.json, re-read only when the file's mtime changes
+        self._trading_settings = None
+        self._settings_version = None
+        
+        # Market status changes a few times a day, don't ask IG on every webhook
+        self._market_details_cache = TTLCache(maxsize=512, ttl=60)
+        
+        # Webhooks accepted by enqueue_webhook; the semaphore bounds the backlog
+        self._webhook_executor = ThreadPoolExecutor(max_workers=_WEBHOOK_WORKERS, thread_name_prefix='webhook-bg')
+        self._webhook_slots = threading.BoundedSemaphore(_WEBHOOK_BACKLOG)
+        
+        # Long-lived pool for process_webhook_batch instead of one per batch request
+        self._batch_executor = ThreadPoolExecutor(max_workers=_BATCH_WORKERS, thread_name_prefix='webhook')
+    
+    @property
+    def trade_manager(self):
+        """
+        TradeManager, created on first access
+        
+        Building it loads the ticker CSV and settings, which workers that only
+        serve health checks or pages never need.
+        """
+        if self._trade_manager is None:
+            with self._trade_manager_lock:
+                if self._trade_manager is None:
+                    self._trade_manager = TradeManager()
+        return self._trade_manager
+    
+    def reload_ticker_data(self):
+        """Drop lookups built from the old ticker CSV after it has been rewritten"""
+        self._ticker_lookups = None
+        if self._trade_manager is not None:
+            self._trade_manager.reload_ticker_data()
+    
+    def _file_version(self, attribute):
+        """Modification time of a settings manager file (e.g. 'ticker_data_file'), or None if unknown"""
+        path = getattr(self.settings_manager, attribute, None)
+        if not isinstance(path, str):
+            return None
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+    
+    def _get_trading_settings(self):
+        """
+        Get the 'trading' section of the settings, parsing settings.json only when it changed
+        
+        Returns:
+            dict: Trading settings (read-only, shared between webhooks)
+        """
+        version = self._file_version('settings_file')
+        if self._trading_settings is not None and version is not None and version == self._settings_version:
+            return self._trading_settings
+        
+        trading_settings = self.settings_manager.get_settings().get('trading', {})
+        self._trading_settings = trading_settings
+        self._settings_version = version
+        return trading_settings
+    
+    def _get_ticker_lookups(self):
+        """
+        Build (or reuse) the lookups used to resolve webhook symbols
+        
+        Returns:
+            _TickerLookups: The lookups (empty if the CSV couldn't be read)
+        """
+        version = self._file_version('ticker_data_file')
+        if self._ticker_lookups is not None and version == self._ticker_lookups_version:
+            return self._ticker_lookups
+        
+        ticker_data = self.settings_manager.get_ticker_data()
+        if 'Symbol' not in ticker_data.columns or 'IG EPIC' not in ticker_data.columns:
+            # Unreadable CSV - don't cache, try again on the next webhook
+            return _TickerLookups()
+        
+        lookups = _TickerLookups()
+        for symbol, epic in zip(ticker_data['Symbol'], ticker_data['IG EPIC']):
+            if isinstance(symbol, str):
+                lookups.symbol_to_epic.setdefault(symbol, epic)
+                lookups.base_to_epic.setdefault(symbol.split(':', 1)[-1], epic)
+        
+        if 'Postion Size Max GBP' in ticker_data.columns:
+            for epic, size in zip(ticker_data['IG EPIC'], ticker_data['Postion Size Max GBP']):
+                if not isinstance(epic, str) or epic in lookups.epic_to_size:
+                    continue
+                try:
+                    lookups.epic_to_size[epic] = float(size)
+                except (TypeError, ValueError):
+                    # Unusable size: keep the first row winning, the lookup falls back to the default
+                    lookups.epic_to_size[epic] = None
+        
+        self._ticker_lookups = lookups
+        self._ticker_lookups_version = version
+        return lookups
     
     def update_settings(self, settings=None):
         """
@@ -29,23 +274,30 @@ class WebhookHandler:
             settings (dict): New settings to apply
         """
         logger.info("Updating settings in webhook handler")
-        # Reload settings in trade manager
-        self.trade_manager.load_settings()
+        self._trading_settings = None
+        # Reload settings in trade manager (a new one reads them when it is built)
+        if self._trade_manager is not None:
+            self._trade_manager.load_settings()
     
     def process_webhook(self, data):
         """
         Process incoming webhook data from TradingView
         
         Args:
-            data (dict): Webhook data containing trade information
+            data (dict | bytes | str): Webhook data containing trade information,
+                or the raw JSON body
             
         Returns:
             dict: Response with status and details
         """
         try:
-            # Extract required fields
-            symbol = data.get('symbol')
-            direction = data.get('direction')
+            data = _decode_webhook(data)
+            
+            # Extract required fields (present and non-empty)
+            try:
+                symbol, direction = _WEBHOOK_REQUIRED(data)
+            except KeyError:
+                symbol = direction = None
             price = data.get('price')
             stop = data.get('stop')
             limit = data.get('limit')
@@ -53,15 +305,11 @@ class WebhookHandler:
             message = data.get('message', '')
             
             # Validate required fields
-            if not all([symbol, direction]):
-                return {
-                    'status': 'error',
-                    'message': 'Missing required fields: symbol and direction are required'
-                }
+            if not (symbol and direction):
+                return _ERR_MISSING_FIELDS
                 
             # Get trading settings
-            settings = self.settings_manager.get_settings()
-            trading_settings = settings.get('trading', {})
+            trading_settings = self._get_trading_settings()
             
             # Get default order type from settings
             default_order_type = trading_settings.get('default_order_type', 'LIMIT')
@@ -75,7 +323,7 @@ class WebhookHandler:
                 }
                 
             # Validate direction
-            if direction not in ['BUY', 'SELL']:
+            if direction not in _VALID_DIRECTIONS:
                 return {
                     'status': 'error',
                     'message': f'Invalid direction: {direction}. Must be BUY or SELL'
@@ -86,30 +334,30 @@ class WebhookHandler:
                 size = self._get_position_size(epic)
                 
             # Log the order type being used
-            logger.info(f"Using order type from settings: {default_order_type}")
-            
-            # Get market details to check if market is closed
-            market_details = self.ig_api._get_market_details(epic)
-            market_status = "CLOSED"  # Default to closed if we can't determine
+            logger.info("Using order type from settings: %s", default_order_type)
             
-            if market_details:
-                market_status = market_details.get('market_status', 'CLOSED')
+            # Get market details to check if market is closed - a forced working order doesn't need them
+            if default_order_type == "WORKING_ORDER":
+                market_status = "NOT_CHECKED"
+            else:
+                market_status = self._get_market_status(epic)
             
-            logger.info(f"Market status for {symbol}: {market_status}")
+            logger.info("Market status for %s: %s", symbol, market_status)
             
             # If market is closed or default is WORKING_ORDER, use working order
             if market_status in ["CLOSED", "EDITS_ONLY"] or default_order_type == "WORKING_ORDER":
-                logger.info(f"Creating WORKING ORDER for {symbol} - Market status: {market_status}")
+                logger.info("Creating WORKING ORDER for %s - Market status: %s", symbol, market_status)
                 
                 # Use the provided stop and limit values directly
                 stop_level = stop
                 limit_level = limit
                 
                 # Log the levels
-                logger.info(f"Working order levels - Price: {price}, Stop: {stop_level}, Limit: {limit_level}")
+                logger.info("Working order levels - Price: %s, Stop: %s, Limit: %s", price, stop_level, limit_level)
                 
                 # Create working order
-                result = self.ig_api.create_working_order(
+                result = self._call_with_retry(
+                    self.ig_api.create_working_order,
                     epic=epic,
                     direction=direction,
                     size=size,
@@ -122,7 +370,8 @@ class WebhookHandler:
                 use_limit_order = (default_order_type == 'LIMIT')
                 
                 # Create position
-                result = self.ig_api.create_position(
+                result = self._call_with_retry(
+                    self.ig_api.create_position,
                     epic=epic,
                     direction=direction,
                     size=size,
@@ -134,8 +383,8 @@ class WebhookHandler:
                 )
             
             # Log the result
-            logger.info(f"Webhook processed: {message}")
-            logger.info(f"Position result: {result}")
+            logger.info("Webhook processed: %s", message)
+            logger.info("Position result: %s", result)
             
             return {
                 'status': 'success',
@@ -144,12 +393,146 @@ class WebhookHandler:
             }
             
         except Exception as e:
-            logger.error(f"Error processing webhook: {str(e)}")
+            logger.error("Error processing webhook: %s", e)
             return {
                 'status': 'error',
                 'message': f'Error processing webhook: {str(e)}'
             }
             
+    def _get_market_status(self, epic):
+        """
+        Get the IG market status of an instrument, cached for a minute
+        
+        Args:
+            epic (str): IG EPIC code
+        
+        Returns:
+            str: Market status, 'CLOSED' if it can't be determined
+        """
+        market_details = self._market_details_cache.get(epic)
+        if market_details is None:
+            market_details = self.ig_api._get_market_details(epic)
+            if market_details:
+                self._market_details_cache[epic] = market_details
+        
+        if market_details:
+            return market_details.get('market_status', 'CLOSED')
+        return "CLOSED"  # Default to closed if we can't determine
+    
+    def _call_with_retry(self, fn, **kwargs):
+        """
+        Call an IG order method, retrying transient failures with exponential backoff
+        
+        Only rate limit and allowance rejections are retried, since IG can't have
+        placed the order. Exceptions are raised: a connection aborted after the request
+        went out may still have placed it (failed connects are already retried by the
+        session's transport adapter).
+        
+        Args:
+            fn (callable): IG API method, e.g. self.ig_api.create_position
+            **kwargs: Arguments for fn
+        
+        Returns:
+            dict: Result of the last attempt
+        """
+        backoff = _ORDER_BACKOFF_MIN
+        for attempt in range(1, _ORDER_ATTEMPTS + 1):
+            last_attempt = attempt == _ORDER_ATTEMPTS
+            result = fn(**kwargs)
+            if last_attempt or not _is_rate_limited(result):
+                return result
+            logger.warning("IG rate limit (attempt %s/%s), retrying in %.1fs: %s", attempt, _ORDER_ATTEMPTS, backoff, result.get('reason'))
+            
+            time.sleep(backoff)
+            backoff = min(backoff * 2, _ORDER_BACKOFF_MAX)
+    
+    def enqueue_webhook(self, data):
+        """
+        Accept a webhook and process it in the background
+        
+        With the 'async_webhooks' trading setting off (the default) this is just
+        process_webhook. With it on, only the required fields are checked here and
+        the IG calls run on a worker thread, so the HTTP response doesn't wait for
+        IG (TradingView retries slow endpoints). When the backlog is full the
+        webhook is processed inline, which slows callers down instead of queueing
+        without bound.
+        
+        Args:
+            data (dict | bytes | str): Webhook data as accepted by process_webhook
+        
+        Returns:
+            dict: Acceptance status, or the process_webhook result when processed inline
+        """
+        if not self._get_trading_settings().get('async_webhooks', False):
+            return self.process_webhook(data)
+        
+        try:
+            data = _decode_webhook(data)
+        except ValueError as e:
+            return {'status': 'error', 'message': f'Invalid webhook JSON: {e}'}
+        
+        try:
+            symbol, direction = _WEBHOOK_REQUIRED(data)
+        except KeyError:
+            symbol = direction = None
+        if not (symbol and direction):
+            return _ERR_MISSING_FIELDS
+        
+        if not self._webhook_slots.acquire(blocking=False):
+            logger.warning("Webhook backlog full (%d), processing %s inline", _WEBHOOK_BACKLOG, symbol)
+            return self.process_webhook(data)
+        
+        try:
+            self._webhook_executor.submit(self._run_queued_webhook, data)
+        except RuntimeError:
+            # Executor shut down (interpreter exiting)
+            self._webhook_slots.release()
+            return self.process_webhook(data)
+        return _ACCEPTED
+    
+    def _run_queued_webhook(self, data):
+        """Process a webhook accepted by enqueue_webhook and free its backlog slot"""
+        try:
+            result = self.process_webhook(data)
+            if result.get('status') != 'success':
+                logger.warning("Queued webhook for %s failed: %s", data.get('symbol'), result.get('message'))
+        finally:
+            self._webhook_slots.release()
+    
+    def process_webhook_batch(self, alerts):
+        """
+        Process several webhook payloads, a bounded number of them at a time
+        
+        Each alert spends most of its time waiting for IG, so running a few
+        concurrently lets a burst finish in roughly ceil(N / max_inflight)
+        round-trips instead of N. The alerts run on a pool shared by all batches,
+        so no more than _BATCH_WORKERS run at once in total.
+        
+        Args:
+            alerts (list): Webhook data dicts as accepted by process_webhook
+        
+        Returns:
+            list: process_webhook results in the same order as the alerts
+        """
+        if not alerts:
+            return []
+        
+        max_inflight = max(1, int(self._get_trading_settings().get('max_inflight_webhooks', 5)))
+        if max_inflight == 1 or len(alerts) == 1:
+            return [self.process_webhook(data) for data in alerts]
+        
+        # At most max_inflight alerts of this batch run at once: before submitting
+        # another, wait for the oldest one still running
+        futures = []
+        inflight = deque()
+        for data in alerts:
+            if len(inflight) >= max_inflight:
+                inflight.popleft().result()
+            future = self._batch_executor.submit(self.process_webhook, data)
+            futures.append(future)
+            inflight.append(future)
+        return [future.result() for future in futures]
+    
     def _convert_symbol_to_epic(self, symbol):
         """
         Convert TradingView symbol to IG EPIC
@@ -161,32 +544,29 @@ class WebhookHandler:
             str: IG EPIC code or None if not found
         """
         try:
-            logger = logging.getLogger(__name__)
-            logger.info(f"Converting symbol to EPIC: {symbol}")
+            logger.info("Converting symbol to EPIC: %s", symbol)
             
-            # Get ticker data
-            ticker_data = self.settings_manager.get_ticker_data()
+            lookups = self._get_ticker_lookups()
             
             # Önce tam sembole göre ara (LSE_DLY:SRP gibi formatları da kabul et)
-            match = ticker_data[ticker_data['Symbol'] == symbol]
-            if not match.empty:
-                logger.info(f"Found exact match for {symbol}: {match.iloc[0]['IG EPIC']}")
-                return match.iloc[0]['IG EPIC']
+            if symbol in lookups.symbol_to_epic:
+                epic = lookups.symbol_to_epic[symbol]
+                logger.info("Found exact match for %s: %s", symbol, epic)
+                return epic
+            
+            # Tam eşleşme yoksa borsa öneki olmadan ara; aynı sembol başka bir
+            # önekle kayıtlıysa da bulunur (BATS:AAPL <-> NASDAQ:AAPL, AAPL)
+            base_symbol = symbol.split(':', 1)[-1]
+            if base_symbol in lookups.base_to_epic:
+                epic = lookups.base_to_epic[base_symbol]
+                logger.info("Found partial match for %s using %s: %s", symbol, base_symbol, epic)
+                return epic
             
-            # Tam eşleşme yoksa, ':' karakterini bölerek dene
-            if ':' in symbol:
-                base_symbol = symbol.split(':')[1]
-                match = ticker_data[ticker_data['Symbol'].str.contains(base_symbol, case=True, na=False)]
-                if not match.empty:
-                    logger.info(f"Found partial match for {symbol} using {base_symbol}: {match.iloc[0]['IG EPIC']}")
-                    return match.iloc[0]['IG EPIC']
-                    
-            logger.warning(f"No EPIC found for symbol: {symbol}")
+            logger.warning("No EPIC found for symbol: %s", symbol)
             return None
             
         except Exception as e:
-            logger = logging.getLogger(__name__)
-            logger.error(f"Error converting symbol to EPIC: {str(e)}")
+            logger.error("Error converting symbol to EPIC: %s", e)
             return None
             
     def _get_position_size(self, epic):
@@ -200,20 +580,18 @@ class WebhookHandler:
             float: Position size in GBP
         """
         try:
-            # Get ticker data
-            ticker_data = self.settings_manager.get_ticker_data()
+            epic_to_size = self._get_ticker_lookups().epic_to_size
             
-            # Find matching instrument
-            match = ticker_data[ticker_data['IG EPIC'] == epic]
-            if not match.empty:
-                return float(match.iloc[0]['Postion Size Max GBP'])
+            # Find matching instrument (None: the CSV size couldn't be parsed)
+            size = epic_to_size.get(epic)
+            if size is not None:
+                return size
                 
             # Default size if not found
             return 100.0
             
         except Exception as e:
-            logger = logging.getLogger(__name__)
-            logger.error(f"Error getting position size: {str(e)}")
+            logger.error("Error getting position size: %s", e)
             return 100.0
     
     def _check_reset_daily_trades(self):
@@ -221,7 +599,8 @@ class WebhookHandler:
         today = datetime.now().day
         if today != self.last_reset_day:
             logger.info("Resetting daily trades tracking")
-            self.trade_manager.reset_daily_trades()
+            if self._trade_manager is not None:
+                self._trade_manager.reset_daily_trades()
             self.last_reset_day = today 
 
     def process_alert(self, data):
@@ -229,67 +608,29 @@ class WebhookHandler:
         Process the alert data from TradingView
         """
         try:
-            logger.info(f"Processing webhook data: {data}")
+            logger.info("Processing webhook data: %s", data)
 
             # Extract the essential parameters
-            required_fields = ['epic', 'direction', 'size']
-            for field in required_fields:
-                if field not in data:
-                    logger.error(f"Missing required field: {field}")
-                    return {"status": "error", "reason": f"Missing required field: {field}"}
+            if not data.keys() >= _ALERT_REQUIRED_SET:
+                field = next(f for f in _ALERT_REQUIRED if f not in data)
+                logger.error("Missing required field: %s", field)
+                return {"status": "error", "reason": f"Missing required field: {field}"}
 
             # Get settings
-            settings = self.settings_manager.get_settings()
-            trading_settings = settings.get('trading', {})
+            trading_settings = self._get_trading_settings()
             default_order_type = trading_settings.get('default_order_type', 'LIMIT')
 
+            # Coerce every field once
+            alert = _AlertSchema.from_dict(data)
+
             # Check if this is a market order or a working order based on settings and data
-            if 'order_level' in data or default_order_type == 'LIMIT':
-                # This is a working/limit order
-                return self._process_working_order(data)
-            else:
-                # This is a market order
-                return self._process_market_order(data)
+            kind = 'working' if ('order_level' in data or default_order_type == 'LIMIT') else 'market'
+            method, message = _ALERT_DISPATCH[kind]
+            trade_params = alert.trade_params(kind)
+
+            logger.info(message, trade_params)
+            return getattr(self.trade_manager, method)(trade_params)
 
         except Exception as e:
-            logger.error(f"Error processing webhook data: {str(e)}")
+            logger.error("Error processing webhook data: %s", e)
             return {"status": "error", "reason": str(e)}
-
-    def _process_market_order(self, data):
-        """
-        Process a market order
-        """
-        # Extract trade parameters
-        trade_params = {
-            'epic': data['epic'],
-            'direction': data['direction'],
-            'size': float(data['size']),
-            'limit_distance': float(data.get('limit_distance', 0)),
-            'stop_distance': float(data.get('stop_distance', 0)),
-            'guaranteed_stop': data.get('guaranteed_stop', 'false').lower() == 'true'
-        }
-
-        # Execute the trade
-        logger.info(f"Executing trade with parameters: {trade_params}")
-        result = self.trade_manager.place_trade(trade_params)
-        return result
-
-    def _process_working_order(self, data):
-        """
-        Process a working order (limit order)
-        """
-        # Extract trade parameters
-        trade_params = {
-            'epic': data['epic'],
-            'direction': data['direction'],
-            'size': float(data['size']),
-            'order_level': float(data['order_level']),
-            'limit_distance': float(data.get('limit_distance', 0)),
-            'stop_distance': float(data.get('stop_distance', 0)),
-            'guaranteed_stop': data.get('guaranteed_stop', 'false').lower() == 'true'
-        }
-
-        # Create the working order
-        logger.info(f"Creating working order with parameters: {trade_params}")
-        result = self.trade_manager.create_working_order(trade_params)
-        return result 
\ No newline at end of file